@@ -4,13 +4,49 @@ Interactive interface for reviewing, managing, and generating quiz questions
 """
 
 import streamlit as st
-import json
+import asyncio
+import functools
+import html
 import os
+import pickle
+import threading
+from collections import Counter
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple, Union
 from sol_quiz_generator import SOLQuizGenerator, QuestionType
+import json_utils
 import pandas as pd
 
+try:
+    import simdjson
+except ImportError:  # pysimdjson is optional; used only for the large SOL data file
+    simdjson = None
+
+try:
+    import ijson
+except ImportError:  # ijson is optional; imports fall back to parsing the whole file
+    ijson = None
+
+SOL_DATA_FILE = "all_structured_documents.json"
+# Pickle snapshot of the parsed SOL data; reused while it is newer than the JSON file
+SOL_CACHE_FILE = "all_structured_documents.pkl"
+# Question files with these extensions are read as one document per line
+NDJSON_EXTENSIONS = ('.jsonl', '.ndjson')
+
+DIFFICULTY_COLORS = {
+    "easy": "🟢",
+    "medium": "🟡",
+    "hard": "🔴"
+}
+
+# Question cards rendered per page inside each standard on the review page
+QUESTIONS_PER_PAGE = 20
+
+# Reusing one parser avoids reallocating simdjson's internal buffers on every
+# parse; parsers are not thread-safe and each Streamlit session runs on its own thread
+_simdjson_parser = simdjson.Parser() if simdjson is not None else None
+_simdjson_lock = threading.Lock()
+
 # Page configuration
 st.set_page_config(
     page_title="SOL Quiz Generator",
@@ -35,6 +71,11 @@ st.markdown("""
         margin-bottom: 0.5rem;
         background-color: white;
     }
+    .question-card .question-header {
+        display: flex;
+        justify-content: space-between;
+        margin-bottom: 0.5rem;
+    }
     .feasibility-badge {
         padding: 0.25rem 0.5rem;
         border-radius: 0.25rem;
@@ -59,52 +100,97 @@ st.markdown("""
 
 def initialize_session_state():
     """Initialize session state variables"""
-    if 'sol_data' not in st.session_state:
-        st.session_state.sol_data = None
-    if 'generated_questions' not in st.session_state:
-        st.session_state.generated_questions = None
-    if 'generator' not in st.session_state:
-        st.session_state.generator = None
-    if 'selected_document' not in st.session_state:
-        st.session_state.selected_document = None
-    if 'selected_standard' not in st.session_state:
-        st.session_state.selected_standard = None
-    if 'questions_data' not in st.session_state:
-        st.session_state.questions_data = {}
+    st.session_state.setdefault('sol_data', None)
+    st.session_state.setdefault('generated_questions', None)
+    st.session_state.setdefault('generator', None)
+    st.session_state.setdefault('selected_document', None)
+    st.session_state.setdefault('selected_standard', None)
+    st.session_state.setdefault('questions_data', {})
+    st.session_state.setdefault('questions_rev', 0)
+    st.session_state.setdefault('total_questions', 0)
+    st.session_state.setdefault('standard_index', {})
+
+
+@st.cache_data(show_spinner=False, ttl=None, max_entries=1)
+def _read_sol_data() -> Dict:
+    """Parse the SOL documents file (shared across reruns and sessions)"""
+    # Errors propagate to load_sol_data so a failed load is never cached
+    try:
+        if os.path.getmtime(SOL_CACHE_FILE) >= os.path.getmtime(SOL_DATA_FILE):
+            with open(SOL_CACHE_FILE, 'rb') as f:
+                return pickle.load(f)
+    except Exception:
+        pass  # No usable snapshot (missing, truncated, stale or from another version); parse the JSON below
+
+    with open(SOL_DATA_FILE, 'rb') as f:
+        raw = f.read()
+    if _simdjson_parser is not None:
+        # st.cache_data pickles its result, so the lazy simdjson proxy must be materialized
+        with _simdjson_lock:
+            data = _simdjson_parser.parse(raw).as_dict()
+    else:
+        data = json_utils.loads(raw)
+
+    _write_sol_cache(data)
+    return data
+
+
+def _write_sol_cache(data: Dict):
+    """Write the parsed SOL data snapshot, ignoring failures (e.g. a read-only directory)"""
+    tmp_path = f"{SOL_CACHE_FILE}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(data, f, protocol=5)
+        os.replace(tmp_path, SOL_CACHE_FILE)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
 
 
 def load_sol_data():
     """Load SOL documents from JSON file"""
     try:
-        with open("all_structured_documents.json", 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return _read_sol_data()
     except FileNotFoundError:
-        st.error("❌ all_structured_documents.json not found!")
+        st.error(f"❌ {SOL_DATA_FILE} not found!")
         return None
     except Exception as e:
         st.error(f"❌ Error loading SOL data: {str(e)}")
         return None
 
 
+@st.cache_resource(show_spinner=False)
+def _create_generator(api_key: str) -> SOLQuizGenerator:
+    """Create one generator, and its HTTP connection pool, shared by all sessions"""
+    # Errors propagate to initialize_generator so a failed attempt is never cached
+    return SOLQuizGenerator(api_key=api_key)
+
+
 def initialize_generator():
     """Initialize the SOL Quiz Generator"""
     try:
         api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            from dotenv import load_dotenv
+            load_dotenv()
+            api_key = os.getenv("OPENAI_API_KEY")
         if not api_key:
             st.error("❌ OPENAI_API_KEY not found in environment variables!")
             st.info("💡 Create a .env file with your OpenAI API key")
             return None
-        return SOLQuizGenerator(api_key=api_key)
+        return _create_generator(api_key)
     except Exception as e:
         st.error(f"❌ Error initializing generator: {str(e)}")
         return None
 
 
-def save_questions_to_file(data: Dict, filename: str):
-    """Save questions to JSON file"""
+def save_questions_to_file(data: Union[Dict, bytes], filename: str):
+    """Save questions to JSON file (data may already be serialized JSON bytes)"""
     try:
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        with open(filename, 'wb') as f:
+            f.write(data if isinstance(data, bytes) else json_utils.dumps(data))
         return True
     except Exception as e:
         st.error(f"❌ Error saving file: {str(e)}")
@@ -114,8 +200,8 @@ def save_questions_to_file(data: Dict, filename: str):
 def load_questions_from_file(filename: str) -> Optional[Dict]:
     """Load questions from JSON file"""
     try:
-        with open(filename, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        with open(filename, 'rb') as f:
+            return json_utils.loads(f.read())
     except FileNotFoundError:
         return None
     except Exception as e:
@@ -123,51 +209,168 @@ def load_questions_from_file(filename: str) -> Optional[Dict]:
         return None
 
 
-def render_feasibility_badge(feasibility: str):
-    """Render a colored feasibility badge"""
-    class_name = feasibility.replace('_', '-')
-    return f'<span class="feasibility-badge {class_name}">{feasibility.replace("_", " ").title()}</span>'
+def iter_import_documents(uploaded_file):
+    """Yield the documents of an exported questions file one at a time"""
+    uploaded_file.seek(0)
+    if uploaded_file.name.endswith(NDJSON_EXTENSIONS):
+        # One document per line, so only one is materialized at a time
+        for line in uploaded_file:
+            if line.strip():
+                yield json_utils.loads(line)
+    elif ijson is not None:
+        # Stream documents so only one is materialized at a time
+        yield from ijson.items(uploaded_file, 'documents.item', use_float=True)
+    else:
+        yield from json_utils.loads(uploaded_file.read()).get('documents', [])
 
 
-def render_question_card(question: Dict, question_idx: int, standard_id: str):
-    """Render a single question card with edit/delete options"""
+def build_doc_options(sol_data: Dict) -> List[str]:
+    """Build the document select box labels"""
+    options = []
+    for doc_wrapper in sol_data['documents']:
+        doc = doc_wrapper.get('document', {})
+        options.append(f"{doc.get('course_name')} - {doc.get('grade_level')} ({doc.get('year')})")
+    return options
 
-    with st.container():
-        col1, col2, col3 = st.columns([0.7, 0.15, 0.15])
 
-        with col1:
-            st.markdown(f"**Question {question_idx + 1}** ({question['question_type'].replace('_', ' ').title()})")
+def count_standards(sol_data: Dict) -> int:
+    """Count the standards across all SOL documents"""
+    total = 0
+    for doc_wrapper in sol_data['documents']:
+        for strand in doc_wrapper.get('document', {}).get('strands', []):
+            total += len(strand.get('standards', []))
+    return total
 
-        with col2:
-            if st.button("🗑️ Delete", key=f"delete_{standard_id}_{question_idx}"):
-                return "delete"
 
-        with col3:
-            difficulty_color = {
-                "easy": "🟢",
-                "medium": "🟡",
-                "hard": "🔴"
-            }
-            diff = question.get('difficulty_level', 'medium')
-            st.write(f"{difficulty_color.get(diff, '⚪')} {diff.title()}")
+def count_doc_questions(doc_questions: Dict) -> int:
+    """Count the generated questions in one document"""
+    return sum(len(std_data.get('questions', [])) for std_data in doc_questions.get('standards', []))
 
-        st.markdown(f"**Q:** {question['question_text']}")
 
-        if question.get('options'):
-            st.markdown("**Options:**")
-            for i, opt in enumerate(question['options'], 1):
-                marker = "✓" if opt == question['correct_answer'] else "○"
-                st.markdown(f"{marker} {opt}")
+STATS_TYPE_COLUMNS = {
+    'multiple_choice': 'Multiple Choice',
+    'fill_in_blank': 'Fill in Blank',
+    'true_false': 'True/False',
+    'short_answer': 'Short Answer'
+}
 
-        st.markdown(f"**✓ Answer:** {question['correct_answer']}")
 
-        if question.get('explanation'):
-            with st.expander("📖 Explanation"):
-                st.write(question['explanation'])
+def build_stats_frame(questions_data: Dict) -> pd.DataFrame:
+    """Build the per-standard question statistics table"""
+    standards = []
+    type_counts = Counter()
+    for doc_key, doc_data in questions_data.items():
+        for std_data in doc_data['standards']:
+            std_id = std_data['standard_id']
+            standards.append((doc_key, std_id, len(std_data['questions'])))
+            type_counts.update((doc_key, std_id, q['question_type']) for q in std_data['questions'])
 
-        st.divider()
+    df = pd.DataFrame(standards, columns=['Document', 'Standard', 'Total Questions'])
+
+    # Counter tallies in C; pandas only reshapes the tallies into one column per type
+    if type_counts:
+        counts = pd.Series(type_counts).unstack(fill_value=0)
+        counts.index.names = ['Document', 'Standard']
+        df = df.join(counts, on=['Document', 'Standard'])
+
+    for q_type, column in STATS_TYPE_COLUMNS.items():
+        df[column] = df[q_type].fillna(0).astype(int) if q_type in df else 0
+
+    return df[['Document', 'Standard', 'Total Questions', *STATS_TYPE_COLUMNS.values()]]
+
+
+@st.cache_resource(show_spinner=False)
+def flatten_standards(doc_idx: int, _doc: Dict) -> Tuple[List[Dict], List[str]]:
+    """Flatten a document's standards and build their select box labels"""
+    # Keyed on the document index; the leading underscore stops Streamlit from
+    # hashing the whole document on every rerun. The lists are shared, read-only.
+    all_standards = [
+        standard
+        for strand in _doc['strands']
+        for standard in strand['standards']
+    ]
+    standard_options = [f"{s['id']}: {s['statement'][:80]}..." for s in all_standards]
+    return all_standards, standard_options
+
+
+def build_export_json(questions_data: Dict) -> bytes:
+    """Serialize the question bank in the export file format"""
+    return json_utils.dumps({
+        'export_date': datetime.now().isoformat(),
+        'total_documents': len(questions_data),
+        'documents': list(questions_data.values())
+    })
+
+
+def build_export_ndjson(questions_data: Dict) -> bytes:
+    """Serialize the question bank as NDJSON, one document per line"""
+    return b"".join(json_utils.dumps_line(doc) for doc in questions_data.values())
+
+
+def mark_questions_changed(question_delta: int = 0):
+    """Record a mutation of questions_data; call after every change"""
+    # Bumping the revision invalidates memoize_on_questions values; the running
+    # question total is adjusted in place so it never needs a full recount
+    st.session_state.questions_rev += 1
+    st.session_state.total_questions += question_delta
+
+
+def find_standard(doc_key: str, standard_id: str) -> Optional[int]:
+    """Return the position of standard_id in a document's standards list, or None"""
+    # The {standard_id: position} map is kept beside questions_data rather than in
+    # it so exports stay clean; it is built lazily and dropped when a doc is replaced
+    index = st.session_state.standard_index.get(doc_key)
+    if index is None:
+        index = {
+            std_data['standard_id']: idx
+            for idx, std_data in enumerate(st.session_state.questions_data[doc_key]['standards'])
+        }
+        st.session_state.standard_index[doc_key] = index
+    return index.get(standard_id)
+
+
+def memoize_on_questions(key: str, compute):
+    """Return compute(), re-running it only after questions_data has changed"""
+    cached = st.session_state.get(key)
+    if cached is None or cached[0] != st.session_state.questions_rev:
+        cached = (st.session_state.questions_rev, compute())
+        st.session_state[key] = cached
+    return cached[1]
 
-    return None
+
+@functools.lru_cache(maxsize=8)
+def render_feasibility_badge(feasibility: str):
+    """Render a colored feasibility badge"""
+    class_name = feasibility.replace('_', '-')
+    return f'<span class="feasibility-badge {class_name}">{feasibility.replace("_", " ").title()}</span>'
+
+
+def render_question_card(question: Dict, question_idx: int):
+    """Render a single question card"""
+    # The whole card is one markdown element, so escape model-generated text
+    diff = question.get('difficulty_level') or 'medium'
+    parts = [
+        '<div class="question-card"><div class="question-header">',
+        f"<span><strong>Question {question_idx + 1}</strong> ({question['question_type'].replace('_', ' ').title()})</span>",
+        f"<span>{DIFFICULTY_COLORS.get(diff, '⚪')} {html.escape(diff.title())}</span>",
+        '</div>',
+        f"<p><strong>Q:</strong> {html.escape(question['question_text'])}</p>",
+    ]
+
+    if question.get('options'):
+        options = '<br>'.join(
+            f"{'✓' if opt == question['correct_answer'] else '○'} {html.escape(str(opt))}"
+            for opt in question['options']
+        )
+        parts.append(f"<p><strong>Options:</strong><br>{options}</p>")
+
+    parts.append(f"<p><strong>✓ Answer:</strong> {html.escape(str(question['correct_answer']))}</p>")
+
+    if question.get('explanation'):
+        parts.append(f"<details><summary>📖 Explanation</summary>{html.escape(question['explanation'])}</details>")
+
+    parts.append('</div>')
+    st.markdown(''.join(parts), unsafe_allow_html=True)
 
 
 def sidebar_navigation():
@@ -182,7 +385,7 @@ def sidebar_navigation():
     else:
         st.sidebar.error("❌ OpenAI API Not Connected")
         if st.sidebar.button("🔄 Retry Connection"):
-            st.session_state.generator = initialize_generator()
+            # main() retries initialization at the start of the rerun
             st.rerun()
 
     if st.session_state.sol_data:
@@ -213,21 +416,10 @@ def home_page():
         st.metric("SOL Documents", st.session_state.sol_data['total_documents'] if st.session_state.sol_data else 0)
 
     with col2:
-        total_questions = 0
-        if st.session_state.questions_data:
-            for doc_questions in st.session_state.questions_data.values():
-                for std_data in doc_questions.get('standards', []):
-                    total_questions += len(std_data.get('questions', []))
-        st.metric("Generated Questions", total_questions)
+        st.metric("Generated Questions", st.session_state.total_questions)
 
     with col3:
-        total_standards = 0
-        if st.session_state.sol_data:
-            for doc_wrapper in st.session_state.sol_data['documents']:
-                doc = doc_wrapper['document']
-                for strand in doc.get('strands', []):
-                    total_standards += len(strand.get('standards', []))
-        st.metric("Total Standards", total_standards)
+        st.metric("Total Standards", st.session_state.total_standards)
 
     st.divider()
 
@@ -263,10 +455,7 @@ def browse_standards_page():
 
     # Document selection
     documents = st.session_state.sol_data['documents']
-    doc_options = [
-        f"{doc['document']['course_name']} - {doc['document']['grade_level']} ({doc['document']['year']})"
-        for doc in documents
-    ]
+    doc_options = st.session_state.doc_options
 
     selected_doc_idx = st.selectbox(
         "Select Document",
@@ -321,10 +510,7 @@ def generate_questions_page():
 
     with col1:
         documents = st.session_state.sol_data['documents']
-        doc_options = [
-            f"{doc['document']['course_name']} - {doc['document']['grade_level']}"
-            for doc in documents
-        ]
+        doc_options = st.session_state.doc_options
 
         selected_doc_idx = st.selectbox(
             "Select Document",
@@ -336,23 +522,14 @@ def generate_questions_page():
 
     with col2:
         # Get all standards from document
-        all_standards = []
-        for strand in doc['strands']:
-            for standard in strand['standards']:
-                all_standards.append({
-                    'id': standard['id'],
-                    'statement': standard['statement'],
-                    'data': standard
-                })
-
-        standard_options = [f"{s['id']}: {s['statement'][:80]}..." for s in all_standards]
+        all_standards, standard_options = flatten_standards(selected_doc_idx, doc)
         selected_std_idx = st.selectbox(
             "Select Standard",
             range(len(standard_options)),
             format_func=lambda i: standard_options[i]
         )
 
-        selected_standard = all_standards[selected_std_idx]['data']
+        selected_standard = all_standards[selected_std_idx]
 
     st.divider()
 
@@ -379,31 +556,33 @@ def generate_questions_page():
     if st.button("🚀 Generate Questions", type="primary", use_container_width=True):
         with st.spinner("🤖 AI is generating questions..."):
             try:
-                # First assess feasibility
-                assessment = st.session_state.generator.assess_text_feasibility(
-                    selected_standard,
-                    doc['grade_level']
+                # Assess feasibility while question generation starts speculatively;
+                # the questions are discarded if the standard turns out not feasible
+                q_types = [QuestionType(qt) for qt in question_types[:num_questions]]
+
+                result = asyncio.run(
+                    st.session_state.generator.generate_questions_for_standard_async(
+                        selected_standard,
+                        doc['grade_level'],
+                        num_questions=num_questions,
+                        question_types=q_types if question_types else None
+                    )
                 )
+                assessment = result['assessment']
+                errors = result.pop('errors', None)
+
+                st.info(f"**Feasibility:** {assessment['feasibility']}")
+                st.write(f"**Reasoning:** {assessment['reasoning']}")
 
-                st.info(f"**Feasibility:** {assessment.feasibility}")
-                st.write(f"**Reasoning:** {assessment.reasoning}")
+                if errors:
+                    st.warning(f"⚠️ {len(errors)} question(s) could not be generated: {'; '.join(errors)}")
 
-                if assessment.feasibility == "not_feasible":
+                if assessment['feasibility'] == "not_feasible":
                     st.warning("⚠️ This standard may not be suitable for text-based questions.")
                     proceed = st.checkbox("Generate anyway?")
                     if not proceed:
                         st.stop()
 
-                # Generate questions
-                q_types = [QuestionType(qt) for qt in question_types[:num_questions]]
-
-                result = st.session_state.generator.generate_questions_for_standard(
-                    selected_standard,
-                    doc['grade_level'],
-                    num_questions=num_questions,
-                    question_types=q_types if question_types else None
-                )
-
                 # Store in session state
                 doc_key = f"{doc['course_name']}_{doc['grade_level']}"
                 if doc_key not in st.session_state.questions_data:
@@ -418,30 +597,106 @@ def generate_questions_page():
                     }
 
                 # Check if standard already exists
-                existing_idx = None
-                for idx, std_data in enumerate(st.session_state.questions_data[doc_key]['standards']):
-                    if std_data['standard_id'] == selected_standard['id']:
-                        existing_idx = idx
-                        break
+                standards = st.session_state.questions_data[doc_key]['standards']
+                existing_idx = find_standard(doc_key, selected_standard['id'])
 
                 if existing_idx is not None:
                     # Append to existing questions
-                    st.session_state.questions_data[doc_key]['standards'][existing_idx]['questions'].extend(result['questions'])
+                    standards[existing_idx]['questions'].extend(result['questions'])
                 else:
                     # Add new standard
-                    st.session_state.questions_data[doc_key]['standards'].append(result)
+                    st.session_state.standard_index[doc_key][selected_standard['id']] = len(standards)
+                    standards.append(result)
+                mark_questions_changed(len(result['questions']))
 
                 st.success(f"✅ Generated {len(result['questions'])} questions!")
 
                 # Display generated questions
                 st.subheader("📝 Generated Questions")
                 for i, q in enumerate(result['questions']):
-                    render_question_card(q, i, selected_standard['id'])
+                    render_question_card(q, i)
 
             except Exception as e:
                 st.error(f"❌ Error generating questions: {str(e)}")
 
 
+def delete_questions(std_data: Dict, editor_key: str):
+    """Remove the questions whose rows were deleted in a standard's question table"""
+    deleted_rows = set(st.session_state[editor_key]['deleted_rows'])
+    if not deleted_rows:
+        return
+    std_data['questions'][:] = [
+        q for idx, q in enumerate(std_data['questions']) if idx not in deleted_rows
+    ]
+    mark_questions_changed(-len(deleted_rows))
+    st.toast(f"✅ Deleted {len(deleted_rows)} question(s)!")
+    # st.rerun is a no-op inside callbacks; the fragment picks this up instead
+    st.session_state.totals_stale = True
+
+
+@st.fragment
+def render_standard_questions(std_data: Dict):
+    """Render one standard's assessment and questions as an independently rerun fragment"""
+    if st.session_state.pop('totals_stale', False):
+        # A delete changed the page and sidebar question totals, which live outside this fragment
+        st.rerun(scope="app")
+
+    with st.expander(f"**{std_data['standard_id']}** ({len(std_data['questions'])} questions)", expanded=True):
+
+        # Assessment info
+        assessment = std_data.get('assessment', {})
+        if assessment:
+            col1, col2 = st.columns([0.3, 0.7])
+            with col1:
+                st.markdown(render_feasibility_badge(assessment.get('feasibility', 'unknown')), unsafe_allow_html=True)
+            with col2:
+                st.write(assessment.get('reasoning', ''))
+
+        st.divider()
+
+        questions = std_data['questions']
+
+        # One table widget for the whole standard; delete rows to remove questions.
+        # The key changes with every mutation so the editor never replays stale deletions.
+        if questions:
+            editor_key = f"editor_{std_data['standard_id']}_{st.session_state.questions_rev}"
+            st.data_editor(
+                pd.DataFrame({
+                    'Type': [q['question_type'] for q in questions],
+                    'Difficulty': [q.get('difficulty_level') for q in questions],
+                    'Question': [q['question_text'] for q in questions],
+                    'Answer': [q['correct_answer'] for q in questions]
+                }),
+                key=editor_key,
+                num_rows="dynamic",
+                # Disable cell edits per column; disabled=True would also block row deletion
+                disabled=['Type', 'Difficulty', 'Question', 'Answer'],
+                hide_index=True,
+                use_container_width=True,
+                on_change=delete_questions,
+                args=(std_data, editor_key)
+            )
+
+        # Question cards, one page at a time
+        start = 0
+        if len(questions) > QUESTIONS_PER_PAGE:
+            num_pages = (len(questions) - 1) // QUESTIONS_PER_PAGE + 1
+            page_key = f"page_{std_data['standard_id']}"
+            if st.session_state.get(page_key, 1) > num_pages:
+                st.session_state[page_key] = num_pages
+            page = st.number_input(
+                f"Page (1-{num_pages})", min_value=1, max_value=num_pages, step=1, key=page_key
+            )
+            start = (page - 1) * QUESTIONS_PER_PAGE
+
+        for q_idx in range(start, min(start + QUESTIONS_PER_PAGE, len(questions))):
+            render_question_card(questions[q_idx], q_idx)
+
+        # Generate more questions for this standard
+        if st.button(f"➕ Generate More Questions", key=f"gen_more_{std_data['standard_id']}"):
+            st.info("💡 Go to 'Generate Questions' page and select this standard!")
+
+
 def review_questions_page():
     """Render review questions page"""
     st.title("📝 Review Questions")
@@ -474,36 +729,8 @@ def review_questions_page():
     st.divider()
 
     # Standards and questions
-    for std_idx, std_data in enumerate(doc_data['standards']):
-        with st.expander(f"**{std_data['standard_id']}** ({len(std_data['questions'])} questions)", expanded=True):
-
-            # Assessment info
-            assessment = std_data.get('assessment', {})
-            if assessment:
-                col1, col2 = st.columns([0.3, 0.7])
-                with col1:
-                    st.markdown(render_feasibility_badge(assessment.get('feasibility', 'unknown')), unsafe_allow_html=True)
-                with col2:
-                    st.write(assessment.get('reasoning', ''))
-
-            st.divider()
-
-            # Questions
-            questions_to_remove = []
-            for q_idx, question in enumerate(std_data['questions']):
-                action = render_question_card(question, q_idx, std_data['standard_id'])
-                if action == "delete":
-                    questions_to_remove.append(q_idx)
-
-            # Remove deleted questions
-            for q_idx in reversed(questions_to_remove):
-                del std_data['questions'][q_idx]
-                st.success(f"✅ Question {q_idx + 1} deleted!")
-                st.rerun()
-
-            # Generate more questions for this standard
-            if st.button(f"➕ Generate More Questions", key=f"gen_more_{std_data['standard_id']}"):
-                st.info("💡 Go to 'Generate Questions' page and select this standard!")
+    for std_data in doc_data['standards']:
+        render_standard_questions(std_data)
 
 
 def manage_data_page():
@@ -516,26 +743,35 @@ def manage_data_page():
         st.subheader("📤 Export Questions")
 
         if st.session_state.questions_data:
-            # Prepare export data
-            export_data = {
-                'export_date': datetime.now().isoformat(),
-                'total_documents': len(st.session_state.questions_data),
-                'documents': list(st.session_state.questions_data.values())
-            }
+            export_format = st.radio(
+                "Format", ["JSON", "NDJSON"], horizontal=True,
+                help="NDJSON writes one document per line so large exports can be streamed back in"
+            )
+
+            # Serialize once per change; the same bytes back both save and download
+            if export_format == "NDJSON":
+                export_data = memoize_on_questions(
+                    '_export_ndjson', lambda: build_export_ndjson(st.session_state.questions_data)
+                )
+                default_filename, mime = "exported_questions.jsonl", "application/x-ndjson"
+            else:
+                export_data = memoize_on_questions(
+                    '_export_json', lambda: build_export_json(st.session_state.questions_data)
+                )
+                default_filename, mime = "exported_questions.json", "application/json"
 
-            filename = st.text_input("Filename", "exported_questions.json")
+            filename = st.text_input("Filename", default_filename)
 
             if st.button("💾 Save to File", type="primary"):
                 if save_questions_to_file(export_data, filename):
                     st.success(f"✅ Saved to {filename}")
 
             # Download button
-            json_str = json.dumps(export_data, indent=2)
             st.download_button(
-                label="⬇️ Download JSON",
-                data=json_str,
+                label=f"⬇️ Download {export_format}",
+                data=export_data,
                 file_name=filename,
-                mime="application/json"
+                mime=mime
             )
         else:
             st.info("ℹ️ No questions to export")
@@ -543,17 +779,20 @@ def manage_data_page():
     with col2:
         st.subheader("📥 Import Questions")
 
-        uploaded_file = st.file_uploader("Upload JSON file", type=['json'])
+        uploaded_file = st.file_uploader("Upload JSON or NDJSON file", type=['json', 'jsonl', 'ndjson'])
 
         if uploaded_file:
             try:
-                data = json.load(uploaded_file)
-
                 if st.button("📥 Load Questions"):
                     # Merge with existing data
-                    for doc in data.get('documents', []):
+                    for doc in iter_import_documents(uploaded_file):
                         doc_key = f"{doc['document_info']['course_name']}_{doc['document_info']['grade_level']}"
+                        replaced = st.session_state.questions_data.get(doc_key)
                         st.session_state.questions_data[doc_key] = doc
+                        st.session_state.standard_index.pop(doc_key, None)
+                        mark_questions_changed(
+                            count_doc_questions(doc) - (count_doc_questions(replaced) if replaced else 0)
+                        )
 
                     st.success("✅ Questions imported successfully!")
                     st.rerun()
@@ -567,37 +806,21 @@ def manage_data_page():
     st.subheader("📊 Statistics")
 
     if st.session_state.questions_data:
-        stats_data = []
-        for doc_key, doc_data in st.session_state.questions_data.items():
-            for std_data in doc_data['standards']:
-                question_types = {}
-                for q in std_data['questions']:
-                    q_type = q['question_type']
-                    question_types[q_type] = question_types.get(q_type, 0) + 1
-
-                stats_data.append({
-                    'Document': doc_key,
-                    'Standard': std_data['standard_id'],
-                    'Total Questions': len(std_data['questions']),
-                    'Multiple Choice': question_types.get('multiple_choice', 0),
-                    'Fill in Blank': question_types.get('fill_in_blank', 0),
-                    'True/False': question_types.get('true_false', 0),
-                    'Short Answer': question_types.get('short_answer', 0)
-                })
-
-        df = pd.DataFrame(stats_data)
+        df = memoize_on_questions(
+            '_stats_frame', lambda: build_stats_frame(st.session_state.questions_data)
+        )
         st.dataframe(df, use_container_width=True)
 
         # Summary metrics
         col1, col2, col3, col4 = st.columns(4)
         with col1:
-            st.metric("Total Standards", len(stats_data))
+            st.metric("Total Standards", len(df))
         with col2:
             st.metric("Total Questions", df['Total Questions'].sum())
         with col3:
             st.metric("Avg Questions/Standard", f"{df['Total Questions'].mean():.1f}")
         with col4:
-            most_common_type = df[['Multiple Choice', 'Fill in Blank', 'True/False', 'Short Answer']].sum().idxmax()
+            most_common_type = df[list(STATS_TYPE_COLUMNS.values())].sum().idxmax()
             st.metric("Most Common Type", most_common_type)
     else:
         st.info("ℹ️ No data available")
@@ -610,6 +833,8 @@ def manage_data_page():
 
     if st.button("🗑️ Clear All Questions", type="secondary"):
         st.session_state.questions_data = {}
+        st.session_state.standard_index = {}
+        mark_questions_changed(-st.session_state.total_questions)
         st.success("✅ All questions cleared!")
         st.rerun()
 
@@ -623,7 +848,12 @@ def main():
     if st.session_state.sol_data is None:
         st.session_state.sol_data = load_sol_data()
 
-    # Initialize generator on first run
+        # SOL data never changes after loading, so derive the page lookups once
+        sol_data = st.session_state.sol_data
+        st.session_state.total_standards = count_standards(sol_data) if sol_data else 0
+        st.session_state.doc_options = build_doc_options(sol_data) if sol_data else []
+
+    # Initialize generator once per session (cached across sessions)
     if st.session_state.generator is None:
         st.session_state.generator = initialize_generator()
 
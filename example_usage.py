@@ -55,15 +55,10 @@ def example_2_specific_grade():
     print("=" * 60)
 
     generator = SOLQuizGenerator()
-    data = generator.load_sol_documents("all_structured_documents.json")
+    generator.load_sol_documents("all_structured_documents.json")
 
     # Find Grade 1 Math document
-    grade_1_math = None
-    for doc_wrapper in data['documents']:
-        doc = doc_wrapper['document']
-        if doc.get('grade_level') == 'Grade 1' and doc.get('course_name') == 'Mathematics':
-            grade_1_math = doc
-            break
+    grade_1_math = generator.get_document('Grade 1', 'Mathematics')
 
     if grade_1_math:
         results = generator.process_document(
@@ -94,17 +89,21 @@ def example_3_assess_only():
     first_doc = data['documents'][0]['document']
     grade_level = first_doc['grade_level']
 
-    # Assess first 5 standards
+    # First 3 standards of the first 2 strands, assessed in a single request
+    standards = [
+        standard
+        for strand in first_doc['strands'][:2]
+        for standard in strand['standards'][:3]
+    ]
+
     assessments = []
-    for strand in first_doc['strands'][:2]:  # First 2 strands
-        for standard in strand['standards'][:3]:  # First 3 standards each
-            assessment = generator.assess_text_feasibility(standard, grade_level)
-            assessments.append({
-                'standard_id': assessment.standard_id,
-                'feasibility': assessment.feasibility,
-                'reasoning': assessment.reasoning,
-                'suggested_types': assessment.suggested_question_types
-            })
+    for assessment in generator.assess_text_feasibility_bulk(standards, grade_level):
+        assessments.append({
+            'standard_id': assessment.standard_id,
+            'feasibility': assessment.feasibility,
+            'reasoning': assessment.reasoning,
+            'suggested_types': assessment.suggested_question_types
+        })
 
     print(f"\nAssessed {len(assessments)} standards:\n")
     for a in assessments:
@@ -144,29 +143,44 @@ def example_5_batch_processing():
     generator = SOLQuizGenerator()
     data = generator.load_sol_documents("all_structured_documents.json")
 
-    # Process first 3 documents, 2 standards each
-    batch_results = []
-
+    # Process first 3 documents, 2 standards each. Results are appended to one
+    # JSONL file as they finish, each line tagged with its document_info, so
+    # re-running resumes where it stopped.
     for i, doc_wrapper in enumerate(data['documents'][:3], 1):
         doc = doc_wrapper['document']
         print(f"\nProcessing document {i}: {doc['course_name']} - {doc['grade_level']}")
 
-        results = generator.process_document(
+        summary = generator.process_document_streaming(
             doc,
+            "batch_results.jsonl",
             max_standards=2,
             questions_per_standard=2
         )
+        print(f"Generated {summary['total_questions_generated']} questions "
+              f"({summary['standards_skipped']} standards already done)")
 
-        batch_results.append(results)
+    print("\nBatch processing complete. Results saved to 'batch_results.jsonl'")
 
-    # Save all results
-    output = {
-        "total_documents_processed": len(batch_results),
-        "documents": batch_results
-    }
 
-    generator.save_results(output, "batch_results.json")
-    print("\nBatch processing complete. Results saved to 'batch_results.json'")
+def example_6_batch_api():
+    """Process a document through the OpenAI Batch API"""
+    print("=" * 60)
+    print("EXAMPLE 6: Batch API (half price, results within 24 hours)")
+    print("=" * 60)
+
+    generator = SOLQuizGenerator()
+    data = generator.load_sol_documents("all_structured_documents.json")
+    first_doc = data['documents'][0]['document']
+
+    # Blocks while polling until both batches (assessment, then questions) finish
+    results = generator.process_document_batch(
+        first_doc,
+        max_standards=5,
+        questions_per_standard=2
+    )
+
+    generator.save_results(results, "batch_api_results.json")
+    print(f"\nGenerated {results['total_questions_generated']} questions for {results['standards_processed']} standards")
 
 
 if __name__ == "__main__":
@@ -177,7 +191,8 @@ if __name__ == "__main__":
         "2": example_2_specific_grade,
         "3": example_3_assess_only,
         "4": example_4_custom_model,
-        "5": example_5_batch_processing
+        "5": example_5_batch_processing,
+        "6": example_6_batch_api
     }
 
     if len(sys.argv) > 1 and sys.argv[1] in examples:
@@ -190,6 +205,7 @@ if __name__ == "__main__":
         print("  3 - Assess text feasibility only")
         print("  4 - Use custom OpenAI model")
         print("  5 - Batch process multiple documents")
-        print("\nUsage: python example_usage.py [1-5]")
+        print("  6 - Process a document with the OpenAI Batch API")
+        print("\nUsage: python example_usage.py [1-6]")
         print("\nRunning Example 1 by default...\n")
         example_1_single_standard()
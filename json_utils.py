@@ -0,0 +1,32 @@
+"""
+JSON helpers shared by the generator, the UI helpers and the Streamlit app
+Uses orjson when it is installed and the standard library otherwise
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library
+    orjson = None
+
+
+def loads(data):
+    """Parse JSON from str or bytes"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(data) -> bytes:
+    """Serialize data to indented UTF-8 JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def dumps_line(data) -> bytes:
+    """Serialize data to one compact line of JSON, newline included"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(data, ensure_ascii=False) + "\n").encode('utf-8')
@@ -4,16 +4,319 @@ Generates age-appropriate quiz questions from Virginia Standards of Learning (SO
 Uses OpenAI API to determine if standards are text-appropriate and create various question types.
 """
 
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import functools
+import hashlib
 import json
 import os
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
+import threading
+import time
+import weakref
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Any, Tuple, Union
+from dataclasses import dataclass
 from enum import Enum
-import openai
-from dotenv import load_dotenv
+from tenacity import AsyncRetrying, Retrying, retry_if_exception, stop_after_attempt, wait_random_exponential
+
+import json_utils
+
+if TYPE_CHECKING:
+    import aiohttp  # imported lazily at runtime; see _new_session
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+except ImportError:  # h2 is optional; the sync client then speaks HTTP/1.1
+    h2 = None
+
+try:
+    import simdjson
+except ImportError:  # pysimdjson is optional; used when orjson is unavailable
+    simdjson = None
+
+try:
+    import ijson
+except ImportError:  # ijson is optional; iter_documents then parses the whole file
+    ijson = None
+
+try:
+    import diskcache
+except ImportError:  # diskcache is optional; assessments are then never cached
+    diskcache = None
+
+try:
+    import msgspec
+except ImportError:  # msgspec is optional; responses are then checked for required fields only
+    msgspec = None
+
+# Standards assessed per request by assess_text_feasibility_bulk
+BULK_BATCH_SIZE = 8
+
+# Connection pool size and timeouts (seconds) for both the sync and async clients
+MAX_CONNECTIONS = 200
+REQUEST_TIMEOUT = 60.0
+CONNECT_TIMEOUT = 5.0
+
+# Attempts per API call before a transient error (429, 5xx, timeout) is raised
+MAX_ATTEMPTS = 6
+
+# Starting rate limits (OpenAI tier 1 for gpt-4o-mini); replaced by the limits the
+# API reports in its response headers unless given to SOLQuizGenerator explicitly
+DEFAULT_RPM = 500
+DEFAULT_TPM = 200_000
+# Output tokens reserved per request until the actual usage is known
+OUTPUT_TOKEN_ESTIMATE = 600
+
+# System prompts hold every static instruction; user messages carry only the
+# per-standard fields. (At roughly 250-500 tokens they are below the 1024-token
+# minimum for OpenAI's automatic prompt caching, so no caching discount applies.)
+ASSESSMENT_SYSTEM_PROMPT = """You are an educational assessment expert specializing in creating age-appropriate quiz questions.
+
+You will be given one or more educational standards from the Virginia Standards of Learning, each with its grade level, standard ID, statement and objectives. For each standard, determine if it can be assessed using text-based quiz questions.
+
+Please analyze:
+1. Can this standard be assessed via text-based questions? (feasible/partially_feasible/not_feasible)
+2. Why or why not?
+3. What types of questions would work best? (multiple_choice, fill_in_blank, true_false, short_answer)
+4. Does this require visual aids or diagrams?
+5. Does this require hands-on physical activities?
+
+Respond in JSON format. An assessment object looks like:
+{
+    "feasibility": "feasible|partially_feasible|not_feasible",
+    "reasoning": "explanation of your assessment",
+    "suggested_question_types": ["type1", "type2"],
+    "requires_visual_aids": true/false,
+    "requires_hands_on": true/false
+}"""
+
+QUESTION_SYSTEM_PROMPT = """You are an expert elementary and secondary education teacher who creates engaging, age-appropriate quiz questions.
 
-# Load environment variables
-load_dotenv()
+You will be given an educational standard from the Virginia Standards of Learning with its grade level, and the question type (and optionally a specific objective) for each question to create.
+
+Requirements:
+1. Use age-appropriate vocabulary and sentence structure for the grade level
+2. Each question should directly assess understanding of the standard
+3. For multiple choice: provide 4 options with one correct answer
+4. For fill in blank: indicate the blank with _____
+5. Include a brief explanation of why the answer is correct
+6. Rate difficulty as: easy, medium, or hard
+
+Respond in JSON format. A question object looks like:
+{
+    "question_text": "the question",
+    "correct_answer": "the correct answer",
+    "options": ["option1", "option2", "option3", "option4"],  // only for multiple choice
+    "explanation": "why this answer is correct",
+    "difficulty_level": "easy|medium|hard"
+}"""
+
+BUNDLE_SYSTEM_PROMPT = """You are an educational assessment expert and experienced teacher who creates engaging, age-appropriate quiz questions.
+
+You will be given an educational standard from the Virginia Standards of Learning with its grade level, standard ID, statement and objectives. Work in two steps.
+
+Step 1: determine if the standard can be assessed using text-based quiz questions.
+1. Can this standard be assessed via text-based questions? (feasible/partially_feasible/not_feasible)
+2. Why or why not?
+3. What types of questions would work best? (multiple_choice, fill_in_blank, true_false, short_answer)
+4. Does this require visual aids or diagrams?
+5. Does this require hands-on physical activities?
+Be careful and consistent in this judgement.
+
+Step 2: only if the standard is feasible or partially_feasible, create the requested quiz questions. Be creative and varied here.
+1. Use age-appropriate vocabulary and sentence structure for the grade level
+2. Each question should directly assess understanding of the standard
+3. For multiple choice: provide 4 options with one correct answer
+4. For fill in blank: indicate the blank with _____
+5. Include a brief explanation of why the answer is correct
+6. Rate difficulty as: easy, medium, or hard
+
+Respond in JSON format:
+{
+    "assessment": {
+        "feasibility": "feasible|partially_feasible|not_feasible",
+        "reasoning": "explanation of your assessment",
+        "suggested_question_types": ["type1", "type2"],
+        "requires_visual_aids": true/false,
+        "requires_hands_on": true/false
+    },
+    "questions": [
+        {
+            "question_type": "multiple_choice|fill_in_blank|true_false|short_answer",
+            "question_text": "the question",
+            "correct_answer": "the correct answer",
+            "options": ["option1", "option2", "option3", "option4"],  // only for multiple choice
+            "explanation": "why this answer is correct",
+            "difficulty_level": "easy|medium|hard"
+        }
+    ]
+}
+"questions" must be an empty list when the standard is not_feasible."""
+
+# Concrete language guidance per grade, appended to the question-writing system
+# prompts so the model does not have to infer what "age-appropriate" means
+GRADE_RUBRIC: Dict[str, str] = {
+    "Grade K": (
+        "Use only Dolch pre-primer and primer sight words and simple concrete nouns. "
+        "Keep sentences to 6 words or fewer, in the present tense, with one idea each. "
+        "Questions will be read aloud by a teacher; avoid negatives such as \"not\"."
+    ),
+    "Grade 1": (
+        "Use Dolch pre-primer through first-grade words and familiar everyday nouns. "
+        "Keep sentences to 8 words or fewer and a single clause. "
+        "Use familiar settings (home, school, pets) and avoid negatively worded questions."
+    ),
+    "Grade 2": (
+        "Use Dolch words through second grade and common two-syllable words. "
+        "Keep sentences to 10 words or fewer; join clauses only with \"and\" or \"because\". "
+        "Introduce subject terms only when they appear in the standard."
+    ),
+    "Grade 3": (
+        "Use Dolch words through third grade plus subject terms from the standard. "
+        "Keep sentences to 12 words or fewer; simple compound sentences are fine. "
+        "Keep answer options to 1-5 words."
+    ),
+    "Grade 4": (
+        "Use grade 4 vocabulary plus subject terms from the standard, explained in context on first use. "
+        "Keep sentences to 15 words or fewer. Short two-step questions are acceptable."
+    ),
+    "Grade 5": (
+        "Use grade 5 vocabulary and subject terms from the standard. "
+        "Keep sentences to 15 words or fewer; a scenario may run to 2 sentences. "
+        "Two-step questions are acceptable."
+    ),
+    "Grade 6": (
+        "Use middle-school academic vocabulary (compare, explain, evidence) and subject terms. "
+        "Keep sentences to 18 words or fewer; a scenario may run to 3 sentences. "
+        "Multi-step reasoning is acceptable."
+    ),
+    "Grade 7": (
+        "Use middle-school academic vocabulary and precise subject terms. "
+        "Keep sentences to 20 words or fewer; a scenario may run to 3 sentences. "
+        "Multi-step reasoning is acceptable."
+    ),
+    "Grade 8": (
+        "Use middle-school academic vocabulary and precise subject terms. "
+        "Keep sentences to 20 words or fewer; a scenario may run to 4 sentences. "
+        "Questions may ask students to analyze or justify."
+    ),
+    "Grade 9": (
+        "Use high-school academic and discipline-specific vocabulary precisely. "
+        "Keep sentences to 25 words or fewer; a scenario may run to 4 sentences. "
+        "Questions may require analysis, application or multi-step reasoning."
+    ),
+    "Grade 10": (
+        "Use high-school academic and discipline-specific vocabulary precisely. "
+        "Keep sentences to 25 words or fewer; a scenario may run to 4 sentences. "
+        "Questions may require analysis, application or multi-step reasoning."
+    ),
+    "Grade 11": (
+        "Use advanced academic and discipline-specific vocabulary without simplification. "
+        "Sentences may run to 30 words; a scenario or short source may run to 5 sentences. "
+        "Questions may require evaluation and synthesis."
+    ),
+    "Grade 12": (
+        "Use advanced academic and discipline-specific vocabulary without simplification. "
+        "Sentences may run to 30 words; a scenario or short source may run to 5 sentences. "
+        "Questions may require evaluation and synthesis."
+    ),
+}
+
+
+# User message templates, filled with str.format_map; only these fields vary per request
+STANDARD_DETAILS_TEMPLATE = """Standard ID: {standard_id}
+Standard Statement: {statement}
+Objectives:
+{objectives_json}"""
+
+ASSESSMENT_PROMPT_TEMPLATE = """Assess this standard. Respond with a single assessment object.
+
+Grade Level: {grade_level}
+{standard_details}"""
+
+BULK_ASSESSMENT_PROMPT_TEMPLATE = """Assess these {count} standards. Respond with {{"assessments": [...]}} holding one assessment object per standard, in the order given, each with an added "standard_id" field.
+
+Grade Level: {grade_level}
+
+{listing}"""
+
+QUESTION_PROMPT_TEMPLATE = """Create one question. Respond with a single question object.
+
+Grade Level: {grade_level}
+Standard ID: {standard_id}
+Standard Statement: {statement}{objective_text}
+
+Question Type: {question_type}"""
+
+BULK_QUESTION_PROMPT_TEMPLATE = """Create {count} questions. Respond with {{"questions": [...]}} holding one question object per item below, in the order given.
+
+Grade Level: {grade_level}
+Standard ID: {standard_id}
+Standard Statement: {statement}
+
+Questions to create:
+{listing}"""
+
+
+def _freeze(value):
+    """Hashable form of a JSON value that still distinguishes dicts, lists and key order"""
+    if isinstance(value, dict):
+        return ("{",) + tuple((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return ("[",) + tuple(_freeze(item) for item in value)
+    return value
+
+
+class _JSONKey:
+    """Wraps a JSON value so it can be an lru_cache argument"""
+    __slots__ = ("value", "_frozen")
+
+    def __init__(self, value):
+        self.value = value
+        self._frozen = _freeze(value)
+
+    def __hash__(self) -> int:
+        return hash(self._frozen)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, _JSONKey) and self._frozen == other._frozen
+
+
+@functools.lru_cache(maxsize=4096)
+def _cached_dumps(key: _JSONKey) -> str:
+    """Indented JSON for a value; repeated standards reuse the serialized objectives"""
+    return json.dumps(key.value, indent=2)
+
+
+@functools.lru_cache(maxsize=64)
+def _system_prompt_for_grade(system_prompt: str, grade_level: str) -> str:
+    """
+    A question-writing system prompt with the grade's rubric appended, if it has one
+
+    Memoized only to avoid rebuilding the string per request; the result is
+    still below the 1024-token minimum for OpenAI's prompt caching.
+    """
+    grade = str(grade_level or '').strip()
+    if grade.lower().startswith('grade '):
+        grade = grade[6:].strip()
+    if grade.lower() in ('k', 'kindergarten'):
+        grade = 'K'
+    rubric = GRADE_RUBRIC.get(f"Grade {grade}")
+    if not rubric:
+        return system_prompt
+    return f"{system_prompt}\n\nLanguage guidance for Grade {grade}: {rubric}"
+
+
+BUNDLE_PROMPT_TEMPLATE = """Assess this standard and, if it is feasible, create {count} questions.
+
+Grade Level: {grade_level}
+{standard_details}
+
+Questions to create, in order:
+{listing}"""
 
 
 class QuestionType(Enum):
@@ -31,7 +334,7 @@ class TextFeasibility(Enum):
     NOT_FEASIBLE = "not_feasible"
 
 
-@dataclass
+@dataclass(slots=True)
 class QuizQuestion:
     """Represents a generated quiz question"""
     standard_id: str
@@ -43,10 +346,19 @@ class QuizQuestion:
     difficulty_level: Optional[str] = None
 
     def to_dict(self) -> Dict:
-        return asdict(self)
+        # Explicit literal instead of dataclasses.asdict, which recurses and deep-copies
+        return {
+            "standard_id": self.standard_id,
+            "question_type": self.question_type,
+            "question_text": self.question_text,
+            "correct_answer": self.correct_answer,
+            "options": list(self.options) if self.options is not None else None,
+            "explanation": self.explanation,
+            "difficulty_level": self.difficulty_level
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class StandardAssessment:
     """Assessment of whether a standard can be tested via text"""
     standard_id: str
@@ -56,25 +368,282 @@ class StandardAssessment:
     requires_visual_aids: bool
     requires_hands_on: bool
 
+    def to_dict(self) -> Dict:
+        return {
+            "standard_id": self.standard_id,
+            "feasibility": self.feasibility,
+            "reasoning": self.reasoning,
+            "suggested_question_types": list(self.suggested_question_types),
+            "requires_visual_aids": self.requires_visual_aids,
+            "requires_hands_on": self.requires_hands_on
+        }
+
+
+# Fields a response object must have when msgspec is not installed to check types too
+ASSESSMENT_FIELDS = ("feasibility", "reasoning", "suggested_question_types", "requires_visual_aids", "requires_hands_on")
+QUESTION_FIELDS = ("question_text", "correct_answer")
+
+if msgspec is not None:
+    class AssessmentSchema(msgspec.Struct):
+        """Expected shape of an assessment object from the model"""
+        feasibility: str
+        reasoning: str
+        suggested_question_types: List[str]
+        requires_visual_aids: bool
+        requires_hands_on: bool
+
+    class QuestionSchema(msgspec.Struct):
+        """Expected shape of a question object from the model"""
+        question_text: str
+        correct_answer: Union[str, bool, int, float]
+        options: Optional[List[str]] = None
+        explanation: Optional[str] = None
+        difficulty_level: Optional[str] = None
+else:
+    AssessmentSchema = QuestionSchema = None
+
+SCHEMA_RETRY_PROMPT = """Your previous response did not match the schema ({error}). Respond again with a single JSON object containing every required field with the correct types."""
+
+
+class ResponseSchemaError(ValueError):
+    """A model response that is not valid JSON or lacks required fields"""
+
+
+def _check_response(result: Any, schema, required: Tuple[str, ...]) -> Dict:
+    """Validate one parsed response object, returning it as a dict"""
+    if msgspec is not None:
+        try:
+            return msgspec.structs.asdict(msgspec.convert(result, schema))
+        except msgspec.ValidationError as e:
+            raise ResponseSchemaError(str(e)) from e
+    if not isinstance(result, dict):
+        raise ResponseSchemaError(f"expected an object, got {type(result).__name__}")
+    missing = [field for field in required if field not in result]
+    if missing:
+        raise ResponseSchemaError(f"missing {', '.join(missing)}")
+    return result
+
+
+def _decode_response(content, schema, required: Tuple[str, ...]) -> Dict:
+    """Parse and validate a response body; msgspec does both in a single pass"""
+    if msgspec is not None:
+        try:
+            return msgspec.structs.asdict(msgspec.json.decode(content, type=schema))
+        except msgspec.DecodeError as e:  # ValidationError is a DecodeError
+            raise ResponseSchemaError(str(e)) from e
+    try:
+        result = json_utils.loads(content)
+    except ValueError as e:
+        raise ResponseSchemaError(f"invalid JSON: {e}") from e
+    return _check_response(result, schema, required)
+
+
+def _decode_object(content, list_field: str) -> Dict:
+    """Parse a multi-item response body: a JSON object whose list_field, if present, is a list"""
+    try:
+        result = json_utils.loads(content)
+    except ValueError as e:
+        raise ResponseSchemaError(f"invalid JSON: {e}") from e
+    if not isinstance(result, dict):
+        raise ResponseSchemaError(f"expected an object, got {type(result).__name__}")
+    result.setdefault(list_field, [])
+    if not isinstance(result[list_field], list):
+        raise ResponseSchemaError(f"expected a list under {list_field}")
+    return result
+
+
+class RateLimiter:
+    """Request and token budgets per minute, shared by every API call"""
+
+    def __init__(self, rpm: float, tpm: float):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.available_requests = float(rpm)
+        self.available_tokens = float(tpm)
+        self._last_refill = time.monotonic()
+        # Sync calls may come from several threads, async ones from several loops
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        """Add the capacity accrued since the last refill (caller holds the lock)"""
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self.available_requests = min(self.rpm, self.available_requests + elapsed * self.rpm / 60)
+        self.available_tokens = min(self.tpm, self.available_tokens + elapsed * self.tpm / 60)
+
+    def _try_acquire(self, tokens: int, requests: int = 1) -> float:
+        """Take capacity if available; otherwise return the seconds to wait"""
+        with self._lock:
+            self._refill()
+            # A request larger than the whole budget would otherwise never run
+            tokens = min(tokens, self.tpm)
+            if self.available_requests >= requests and self.available_tokens >= tokens:
+                self.available_requests -= requests
+                self.available_tokens -= tokens
+                return 0.0
+            return max(
+                (requests - self.available_requests) * 60 / self.rpm,
+                (tokens - self.available_tokens) * 60 / self.tpm,
+                0.01
+            )
+
+    def acquire(self, tokens: int, requests: int = 1):
+        """Block until the request fits within the limits"""
+        while True:
+            delay = self._try_acquire(tokens, requests)
+            if not delay:
+                return
+            time.sleep(delay)
+
+    async def acquire_async(self, tokens: int, requests: int = 1):
+        """Wait, without blocking the event loop, until the request fits within the limits"""
+        while True:
+            delay = self._try_acquire(tokens, requests)
+            if not delay:
+                return
+            await asyncio.sleep(delay)
+
+    def record_usage(self, estimated_tokens: int, actual_tokens: int):
+        """Correct the token budget once a response reports its real usage"""
+        with self._lock:
+            self.available_tokens = min(self.tpm, self.available_tokens + estimated_tokens - actual_tokens)
+
+    def update_limits(self, rpm: Optional[float] = None, tpm: Optional[float] = None):
+        """Adopt new per-minute limits"""
+        with self._lock:
+            if rpm:
+                self.rpm = rpm
+            if tpm:
+                self.tpm = tpm
+
+
+class APIStatusError(Exception):
+    """Error response from the chat completions endpoint"""
+
+    def __init__(self, status: int, message: str, retry_after: Optional[float] = None):
+        super().__init__(f"OpenAI API error {status}: {message}")
+        self.status = status
+        self.retry_after = retry_after
+
+
+def _retry_after(headers) -> Optional[float]:
+    """Seconds to wait according to Retry-After style headers, if present"""
+    for name, scale in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+        value = headers.get(name)
+        if value:
+            try:
+                return float(value) * scale
+            except ValueError:
+                pass  # HTTP-date form; fall back to exponential backoff
+    return None
+
+
+def _is_transient(exc: BaseException) -> bool:
+    """Whether a failed API call is worth retrying"""
+    if isinstance(exc, APIStatusError):
+        return exc.status == 429 or exc.status >= 500
+    # Already imported by the time a request has failed
+    import aiohttp
+    import openai
+    return isinstance(exc, (
+        asyncio.TimeoutError,
+        aiohttp.ClientConnectionError,
+        openai.RateLimitError,
+        openai.APIConnectionError,
+        openai.InternalServerError
+    ))
+
+
+_backoff = wait_random_exponential(min=1, max=60)
+
+
+def _retry_wait(retry_state) -> float:
+    """Wait as long as the server asked, otherwise back off exponentially with jitter"""
+    import openai
+
+    exc = retry_state.outcome.exception()
+    delay = None
+    if isinstance(exc, APIStatusError):
+        delay = exc.retry_after
+    elif isinstance(exc, openai.APIStatusError):
+        delay = _retry_after(exc.response.headers)
+    return delay if delay is not None else _backoff(retry_state)
+
+
+def _retry_options(label: str) -> Dict[str, Any]:
+    """tenacity settings shared by the sync and async API calls"""
+    return {
+        "stop": stop_after_attempt(MAX_ATTEMPTS),
+        "wait": _retry_wait,
+        "retry": retry_if_exception(_is_transient),
+        "reraise": True,
+        "before_sleep": lambda state: print(
+            f"Retrying {label} (attempt {state.attempt_number} failed: {state.outcome.exception()})"
+        )
+    }
+
 
 class SOLQuizGenerator:
     """Main class for generating quiz questions from SOL standards"""
 
-    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4o-mini"):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: str = "gpt-4o-mini",
+        cache_dir: Optional[str] = ".sol_cache",
+        rpm: Optional[float] = None,
+        tpm: Optional[float] = None
+    ):
         """
         Initialize the quiz generator.
 
         Args:
             api_key: OpenAI API key (defaults to OPENAI_API_KEY env var)
             model: OpenAI model to use (default: gpt-4o-mini for cost efficiency)
+            cache_dir: Directory for the on-disk assessment cache (None to disable;
+                requires the optional diskcache package)
+            rpm: Requests-per-minute limit (defaults to the limit reported by the API)
+            tpm: Tokens-per-minute limit (defaults to the limit reported by the API)
         """
+        if not api_key and not os.getenv("OPENAI_API_KEY"):
+            from dotenv import load_dotenv
+            load_dotenv()
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         if not self.api_key:
             raise ValueError("OpenAI API key must be provided or set in OPENAI_API_KEY environment variable")
 
-        openai.api_key = self.api_key
+        # Imported here rather than at module level: openai pulls in httpx and
+        # pydantic, which is slow and unnecessary for code that never calls the API
+        import httpx
+        import openai
+
         self.model = model
-        self.client = openai.OpenAI(api_key=self.api_key)
+        # One pooled (HTTP/2 when h2 is installed) connection pool for all sync calls;
+        # retries are handled by tenacity in _chat
+        self._http = httpx.Client(
+            limits=httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_CONNECTIONS // 2),
+            http2=h2 is not None,
+            timeout=httpx.Timeout(REQUEST_TIMEOUT, connect=CONNECT_TIMEOUT)
+        )
+        self.client = openai.OpenAI(api_key=self.api_key, http_client=self._http, max_retries=0)
+        # Async calls POST to the REST endpoint directly through aiohttp
+        self.base_url = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1").rstrip('/')
+        self._sessions = weakref.WeakKeyDictionary()
+        # Lookup tables over the most recently loaded SOL data
+        self._by_grade_course: Dict[Tuple[str, str], Dict] = {}
+        self._by_standard_id: Dict[str, Tuple[Dict, Dict, Dict]] = {}
+        self._standards_by_doc: Dict[int, Tuple[Dict, List[Dict]]] = {}
+        # Assessments are deterministic enough (temperature 0.3) to reuse across runs;
+        # generated questions are not cached since variety is the point
+        self._assessment_cache = diskcache.Cache(cache_dir) if diskcache is not None and cache_dir else None
+        # Limits passed in explicitly are kept; the others follow the response headers
+        self.rate_limiter = RateLimiter(rpm or DEFAULT_RPM, tpm or DEFAULT_TPM)
+        self._limits_from_headers = (rpm is None, tpm is None)
+        # Worker threads for process_document, one pool per max_concurrency, created on
+        # first use and reused across documents (and sessions sharing this generator)
+        self._executors: Dict[int, ThreadPoolExecutor] = {}
+        self._executors_lock = threading.Lock()
 
     def load_sol_documents(self, filepath: str) -> Dict:
         """
@@ -86,57 +655,274 @@ class SOLQuizGenerator:
         Returns:
             Dictionary containing all SOL documents
         """
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return json.load(f)
-
-    def assess_text_feasibility(self, standard: Dict, grade_level: str) -> StandardAssessment:
+        # One binary read; every parser below accepts UTF-8 bytes directly
+        with open(filepath, 'rb') as f:
+            raw = f.read()
+
+        if json_utils.orjson is None and simdjson is not None:
+            data = simdjson.Parser().parse(raw).as_dict()
+        else:
+            data = json_utils.loads(raw)
+
+        self._index_documents(data)
+        return data
+
+    def _index_documents(self, data: Dict):
+        """Build the lookup tables behind get_document, get_standard and _standards_of"""
+        # The first occurrence wins for repeated keys (the same course appears for
+        # several years), matching what a front-to-back scan would find
+        self._by_grade_course = {}
+        self._by_standard_id = {}
+        self._standards_by_doc = {}
+
+        for doc_wrapper in data.get('documents', []):
+            document = doc_wrapper.get('document')
+            if document is None:
+                continue
+            self._by_grade_course.setdefault((document.get('grade_level'), document.get('course_name')), document)
+
+            standards = []
+            for strand in document.get('strands', []):
+                for standard in strand.get('standards', []):
+                    standards.append(standard)
+                    self._by_standard_id.setdefault(standard.get('id'), (document, strand, standard))
+            self._standards_by_doc[id(document)] = (document, standards)
+
+    def get_document(self, grade_level: str, course_name: str) -> Optional[Dict]:
         """
-        Determine if a standard can be assessed via text-based questions.
+        Look up a loaded document by grade level and course.
 
         Args:
-            standard: The standard object from SOL document
-            grade_level: Grade level (e.g., "Grade 1", "Grade 5")
+            grade_level: Grade level (e.g., "Grade 1")
+            course_name: Course name (e.g., "Mathematics")
 
         Returns:
-            StandardAssessment object with feasibility analysis
+            The document object, or None if no loaded document matches
         """
-        prompt = f"""Analyze the following educational standard and determine if it can be assessed using text-based quiz questions.
+        return self._by_grade_course.get((grade_level, course_name))
 
-Grade Level: {grade_level}
-Standard ID: {standard.get('id', 'N/A')}
-Standard Statement: {standard.get('statement', 'N/A')}
+    def get_standard(self, standard_id: str) -> Optional[Tuple[Dict, Dict, Dict]]:
+        """
+        Look up a loaded standard by ID.
 
-Objectives:
-{json.dumps(standard.get('knowledge_and_skills', {}).get('objectives', []), indent=2)}
+        Args:
+            standard_id: Standard ID (e.g., "1.2a")
 
-Please analyze:
-1. Can this standard be assessed via text-based questions? (feasible/partially_feasible/not_feasible)
-2. Why or why not?
-3. What types of questions would work best? (multiple_choice, fill_in_blank, true_false, short_answer)
-4. Does this require visual aids or diagrams?
-5. Does this require hands-on physical activities?
+        Returns:
+            Tuple of (document, strand, standard), or None if not found
+        """
+        return self._by_standard_id.get(standard_id)
+
+    def _standards_of(self, document: Dict) -> List[Dict]:
+        """All standards of a document in order, pre-flattened when it was loaded"""
+        indexed = self._standards_by_doc.get(id(document))
+        if indexed is not None and indexed[0] is document:
+            return indexed[1]
+        return [
+            standard
+            for strand in document.get('strands', [])
+            for standard in strand.get('standards', [])
+        ]
+
+    def iter_documents(
+        self,
+        filepath: str,
+        grade_level: Optional[str] = None,
+        course_name: Optional[str] = None
+    ) -> Iterator[Dict]:
+        """
+        Stream the documents in a SOL JSON file, optionally filtered.
 
-Respond in JSON format:
-{{
-    "feasibility": "feasible|partially_feasible|not_feasible",
-    "reasoning": "explanation of your assessment",
-    "suggested_question_types": ["type1", "type2"],
-    "requires_visual_aids": true/false,
-    "requires_hands_on": true/false
-}}"""
-
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": "You are an educational assessment expert specializing in creating age-appropriate quiz questions."},
-                {"role": "user", "content": prompt}
-            ],
-            response_format={"type": "json_object"},
-            temperature=0.3
+        Args:
+            filepath: Path to the all_structured_documents.json file
+            grade_level: Only yield documents for this grade level
+            course_name: Only yield documents for this course
+
+        Returns:
+            Iterator over document objects (the 'document' entry of each wrapper)
+        """
+        def matches(document: Dict) -> bool:
+            return ((grade_level is None or document.get('grade_level') == grade_level) and
+                    (course_name is None or document.get('course_name') == course_name))
+
+        if ijson is not None:
+            # Only one document is materialized at a time
+            with open(filepath, 'rb') as f:
+                for document in ijson.items(f, 'documents.item.document', use_float=True):
+                    if matches(document):
+                        yield document
+            return
+
+        for doc_wrapper in self.load_sol_documents(filepath).get('documents', []):
+            document = doc_wrapper.get('document')
+            if document is not None and matches(document):
+                yield document
+
+    def close(self):
+        """Release the worker threads, the sync HTTP connection pool and the assessment cache"""
+        with self._executors_lock:
+            executors = list(self._executors.values())
+            self._executors.clear()
+        for executor in executors:
+            executor.shutdown()
+        self.client.close()
+        self._http.close()
+        if self._assessment_cache is not None:
+            self._assessment_cache.close()
+
+    def __enter__(self) -> "SOLQuizGenerator":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    async def __aenter__(self) -> "SOLQuizGenerator":
+        """Open a shared HTTP session for async calls made on this event loop"""
+        self._sessions[asyncio.get_running_loop()] = self._new_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        """Close the session opened by __aenter__"""
+        session = self._sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None:
+            await session.close()
+
+    def _new_session(self) -> aiohttp.ClientSession:
+        """Create an aiohttp session with a pooled connector"""
+        import aiohttp
+
+        return aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=MAX_CONNECTIONS),
+            headers={"Authorization": f"Bearer {self.api_key}"},
+            timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT, connect=CONNECT_TIMEOUT)
         )
 
-        result = json.loads(response.choices[0].message.content)
+    @contextlib.asynccontextmanager
+    async def _session_scope(self):
+        """Yield this loop's shared session, opening one for the scope if needed"""
+        # Sessions are bound to the loop that created them, so they are tracked
+        # per loop; this keeps a generator shared across threads safe to use
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is not None:
+            yield session
+            return
+
+        async with self:
+            yield self._sessions[loop]
+
+    def _chat_body(self, messages: List[Dict[str, str]], temperature: float) -> Dict[str, Any]:
+        """Request body for a JSON-mode chat completion"""
+        return {
+            "model": self.model,
+            "messages": messages,
+            "response_format": {"type": "json_object"},
+            "temperature": temperature
+        }
 
+    def _estimate_tokens(self, messages: List[Dict[str, str]]) -> int:
+        """Rough token count of a request (about 4 characters per token) plus its output"""
+        return sum(len(m["content"]) for m in messages) // 4 + OUTPUT_TOKEN_ESTIMATE
+
+    def _observe_response(self, headers, estimated_tokens: int, total_tokens: Optional[int]):
+        """Feed a response's usage and rate-limit headers back into the limiter"""
+        if total_tokens is not None:
+            self.rate_limiter.record_usage(estimated_tokens, total_tokens)
+
+        rpm_from_headers, tpm_from_headers = self._limits_from_headers
+        try:
+            self.rate_limiter.update_limits(
+                rpm=float(headers.get("x-ratelimit-limit-requests") or 0) if rpm_from_headers else None,
+                tpm=float(headers.get("x-ratelimit-limit-tokens") or 0) if tpm_from_headers else None
+            )
+        except ValueError:
+            pass  # Malformed header; keep the current limits
+
+    def _chat(self, messages: List[Dict[str, str]], temperature: float, label: str) -> str:
+        """Run a JSON-mode chat completion, retrying transient errors, and return the content"""
+        estimated_tokens = self._estimate_tokens(messages)
+        for attempt in Retrying(**_retry_options(label)):
+            with attempt:
+                self.rate_limiter.acquire(estimated_tokens)
+                raw = self.client.chat.completions.with_raw_response.create(**self._chat_body(messages, temperature))
+
+        response = raw.parse()
+        self._observe_response(raw.headers, estimated_tokens, response.usage.total_tokens if response.usage else None)
+        return response.choices[0].message.content
+
+    async def _post_chat(self, messages: List[Dict[str, str]], temperature: float, label: str) -> str:
+        """POST a JSON-mode chat completion, retrying transient errors, and return the content"""
+        estimated_tokens = self._estimate_tokens(messages)
+        async with self._session_scope() as session:
+            payload = self._chat_body(messages, temperature)
+            async for attempt in AsyncRetrying(**_retry_options(label)):
+                with attempt:
+                    await self.rate_limiter.acquire_async(estimated_tokens)
+                    async with session.post(f"{self.base_url}/chat/completions", json=payload) as resp:
+                        if resp.status >= 400:
+                            raise APIStatusError(resp.status, await resp.text(), _retry_after(resp.headers))
+                        data = await resp.json(loads=json_utils.loads)
+                        headers = resp.headers
+
+        self._observe_response(headers, estimated_tokens, (data.get("usage") or {}).get("total_tokens"))
+        return data["choices"][0]["message"]["content"]
+
+    def _schema_retry_messages(
+        self,
+        messages: List[Dict[str, str]],
+        content: str,
+        error: ResponseSchemaError
+    ) -> List[Dict[str, str]]:
+        """The original conversation plus the rejected answer and a request to fix it"""
+        return messages + [
+            {"role": "assistant", "content": content},
+            {"role": "user", "content": SCHEMA_RETRY_PROMPT.format_map({"error": error})}
+        ]
+
+    def _chat_parsed(self, messages: List[Dict[str, str]], temperature: float, label: str, parse):
+        """Run _chat and parse the content, asking once more if it does not match the schema"""
+        content = self._chat(messages, temperature, label)
+        try:
+            return parse(content)
+        except ResponseSchemaError as e:
+            print(f"Re-asking {label}: response did not match the schema ({e})")
+            return parse(self._chat(self._schema_retry_messages(messages, content, e), temperature, label))
+
+    async def _post_chat_parsed(self, messages: List[Dict[str, str]], temperature: float, label: str, parse):
+        """Async version of _chat_parsed"""
+        content = await self._post_chat(messages, temperature, label)
+        try:
+            return parse(content)
+        except ResponseSchemaError as e:
+            print(f"Re-asking {label}: response did not match the schema ({e})")
+            return parse(await self._post_chat(self._schema_retry_messages(messages, content, e), temperature, label))
+
+    def _standard_details(self, standard: Dict) -> str:
+        """The variable part of a prompt describing one standard"""
+        return STANDARD_DETAILS_TEMPLATE.format_map({
+            "standard_id": standard.get('id', 'N/A'),
+            "statement": standard.get('statement', 'N/A'),
+            "objectives_json": _cached_dumps(_JSONKey(standard.get('knowledge_and_skills', {}).get('objectives', [])))
+        })
+
+    def _assessment_messages(self, standard: Dict, grade_level: str) -> List[Dict[str, str]]:
+        """Build the chat messages for a feasibility assessment"""
+        prompt = ASSESSMENT_PROMPT_TEMPLATE.format_map({
+            "grade_level": grade_level,
+            "standard_details": self._standard_details(standard)
+        })
+
+        return [
+            {"role": "system", "content": ASSESSMENT_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ]
+
+    def _parse_assessment(self, standard: Dict, content: str) -> StandardAssessment:
+        """Build a StandardAssessment from the model's JSON response"""
+        return self._assessment_from_result(standard, _decode_response(content, AssessmentSchema, ASSESSMENT_FIELDS))
+
+    def _assessment_from_result(self, standard: Dict, result: Dict) -> StandardAssessment:
+        """Build a StandardAssessment from one parsed assessment object"""
         return StandardAssessment(
             standard_id=standard.get('id', 'N/A'),
             feasibility=result['feasibility'],
@@ -146,6 +932,253 @@ Respond in JSON format:
             requires_hands_on=result['requires_hands_on']
         )
 
+    def _question_messages(
+        self,
+        standard: Dict,
+        grade_level: str,
+        question_type: QuestionType,
+        objective: Optional[Dict] = None
+    ) -> List[Dict[str, str]]:
+        """Build the chat messages for generating a single question"""
+        objective_text = ""
+        if objective:
+            objective_text = f"\nSpecific Objective: {objective.get('text', '')}"
+
+        prompt = QUESTION_PROMPT_TEMPLATE.format_map({
+            "grade_level": grade_level,
+            "standard_id": standard.get('id', 'N/A'),
+            "statement": standard.get('statement', 'N/A'),
+            "objective_text": objective_text,
+            "question_type": question_type.value
+        })
+
+        return [
+            {"role": "system", "content": _system_prompt_for_grade(QUESTION_SYSTEM_PROMPT, grade_level)},
+            {"role": "user", "content": prompt}
+        ]
+
+    def _parse_question(self, standard: Dict, question_type: QuestionType, content: str) -> QuizQuestion:
+        """Build a QuizQuestion from the model's JSON response"""
+        return self._question_from_result(standard, question_type, _decode_response(content, QuestionSchema, QUESTION_FIELDS))
+
+    def _question_from_result(self, standard: Dict, question_type: QuestionType, result: Dict) -> QuizQuestion:
+        """Build a QuizQuestion from one parsed question object"""
+        return QuizQuestion(
+            standard_id=standard.get('id', 'N/A'),
+            question_type=question_type.value,
+            question_text=result['question_text'],
+            correct_answer=result['correct_answer'],
+            options=result.get('options'),
+            explanation=result.get('explanation'),
+            difficulty_level=result.get('difficulty_level')
+        )
+
+    def _bulk_assessment_messages(self, standards: List[Dict], grade_level: str) -> List[Dict[str, str]]:
+        """Build the chat messages for assessing several standards in one request"""
+        listing = "\n\n".join(
+            f"Standard {i}:\n{self._standard_details(standard)}"
+            for i, standard in enumerate(standards, 1)
+        )
+
+        prompt = BULK_ASSESSMENT_PROMPT_TEMPLATE.format_map({
+            "count": len(standards),
+            "grade_level": grade_level,
+            "listing": listing
+        })
+
+        return [
+            {"role": "system", "content": ASSESSMENT_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ]
+
+    def _bulk_question_messages(
+        self,
+        standard: Dict,
+        grade_level: str,
+        plan: List[Tuple[QuestionType, Optional[Dict]]]
+    ) -> List[Dict[str, str]]:
+        """Build the chat messages for generating all of a standard's questions in one request"""
+        listing = "\n".join(
+            f"{i}. {q_type.value}" + (f" (Specific Objective: {objective.get('text', '')})" if objective else "")
+            for i, (q_type, objective) in enumerate(plan, 1)
+        )
+
+        prompt = BULK_QUESTION_PROMPT_TEMPLATE.format_map({
+            "count": len(plan),
+            "grade_level": grade_level,
+            "standard_id": standard.get('id', 'N/A'),
+            "statement": standard.get('statement', 'N/A'),
+            "listing": listing
+        })
+
+        return [
+            {"role": "system", "content": _system_prompt_for_grade(QUESTION_SYSTEM_PROMPT, grade_level)},
+            {"role": "user", "content": prompt}
+        ]
+
+    def _assessment_cache_key(self, standard: Dict, grade_level: str) -> str:
+        """Hash everything an assessment depends on"""
+        fields = {
+            "id": standard.get('id'),
+            "grade": grade_level,
+            "stmt": standard.get('statement'),
+            "objs": standard.get('knowledge_and_skills', {}).get('objectives', []),
+            "model": self.model,
+            "prompt": ASSESSMENT_SYSTEM_PROMPT
+        }
+        return hashlib.blake2b(json.dumps(fields, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def _cached_assessment(self, standard: Dict, grade_level: str) -> Optional[StandardAssessment]:
+        """Return a previously stored assessment for this standard, if any"""
+        if self._assessment_cache is None:
+            return None
+        cached = self._assessment_cache.get(self._assessment_cache_key(standard, grade_level))
+        return StandardAssessment(**cached) if cached is not None else None
+
+    def _store_assessment(self, standard: Dict, grade_level: str, assessment: StandardAssessment) -> StandardAssessment:
+        """Store an assessment in the cache and return it"""
+        if self._assessment_cache is not None:
+            self._assessment_cache.set(self._assessment_cache_key(standard, grade_level), assessment.to_dict())
+        return assessment
+
+    def assess_text_feasibility(self, standard: Dict, grade_level: str) -> StandardAssessment:
+        """
+        Determine if a standard can be assessed via text-based questions.
+
+        Args:
+            standard: The standard object from SOL document
+            grade_level: Grade level (e.g., "Grade 1", "Grade 5")
+
+        Returns:
+            StandardAssessment object with feasibility analysis
+        """
+        cached = self._cached_assessment(standard, grade_level)
+        if cached is not None:
+            return cached
+
+        assessment = self._chat_parsed(
+            self._assessment_messages(standard, grade_level),
+            temperature=0.3,
+            label=f"assessment of {standard.get('id')}",
+            parse=lambda content: self._parse_assessment(standard, content)
+        )
+        return self._store_assessment(standard, grade_level, assessment)
+
+    async def assess_text_feasibility_async(self, standard: Dict, grade_level: str) -> StandardAssessment:
+        """Async version of assess_text_feasibility"""
+        cached = self._cached_assessment(standard, grade_level)
+        if cached is not None:
+            return cached
+
+        assessment = await self._post_chat_parsed(
+            self._assessment_messages(standard, grade_level),
+            temperature=0.3,
+            label=f"assessment of {standard.get('id')}",
+            parse=lambda content: self._parse_assessment(standard, content)
+        )
+        return self._store_assessment(standard, grade_level, assessment)
+
+    def assess_text_feasibility_bulk(self, standards: List[Dict], grade_level: str) -> List[StandardAssessment]:
+        """
+        Assess several standards, BULK_BATCH_SIZE per request.
+
+        Args:
+            standards: Standard objects from one SOL document
+            grade_level: Grade level shared by the standards
+
+        Returns:
+            StandardAssessment objects in the same order as standards
+        """
+        # Only standards missing from the cache are sent
+        assessments = [self._cached_assessment(standard, grade_level) for standard in standards]
+        missing = [i for i, assessment in enumerate(assessments) if assessment is None]
+
+        for start in range(0, len(missing), BULK_BATCH_SIZE):
+            positions = missing[start:start + BULK_BATCH_SIZE]
+            batch = [standards[i] for i in positions]
+            try:
+                results = self._chat_parsed(
+                    self._bulk_assessment_messages(batch, grade_level),
+                    temperature=0.3,
+                    label=f"assessment of {len(batch)} standards",
+                    parse=lambda content: _decode_object(content, 'assessments')['assessments']
+                )
+            except ResponseSchemaError as e:
+                # Unusable even after a re-ask; every standard below is assessed on its own
+                print(f"Assessing {len(batch)} standards one at a time: bulk response did not match the schema ({e})")
+                results = []
+
+            # Match entries by standard ID, falling back to position
+            by_id = {r.get('standard_id'): r for r in results if isinstance(r, dict)}
+            for i, (position, standard) in enumerate(zip(positions, batch)):
+                result = by_id.get(standard.get('id'))
+                if result is None and len(results) == len(batch):
+                    result = results[i]
+                try:
+                    if result is None:
+                        raise ResponseSchemaError("standard missing from response")
+                    result = _check_response(result, AssessmentSchema, ASSESSMENT_FIELDS)
+                except ResponseSchemaError:
+                    # The model skipped or garbled this standard; assess it on its own
+                    assessments[position] = self.assess_text_feasibility(standard, grade_level)
+                else:
+                    assessment = self._assessment_from_result(standard, result)
+                    assessments[position] = self._store_assessment(standard, grade_level, assessment)
+
+        return assessments
+
+    def generate_questions_bulk(
+        self,
+        standard: Dict,
+        grade_level: str,
+        question_types: List[QuestionType],
+        num_questions: int = 3,
+        errors: Optional[List[str]] = None
+    ) -> List[QuizQuestion]:
+        """
+        Generate all of a standard's questions in a single request.
+
+        Args:
+            standard: The standard object
+            grade_level: Grade level for age-appropriate language
+            question_types: Question type for each question, in order
+            num_questions: Number of questions to generate
+            errors: Optional list to record questions skipped for not matching the schema
+
+        Returns:
+            QuizQuestion objects (fewer than requested if the model returned
+            fewer or some were malformed)
+        """
+        plan = self._question_plan(standard, num_questions, question_types)
+        if not plan:
+            return []
+
+        results = self._chat_parsed(
+            self._bulk_question_messages(standard, grade_level, plan),
+            temperature=0.7,
+            label=f"questions for {standard.get('id')}",
+            parse=lambda content: _decode_object(content, 'questions')['questions']
+        )
+        return self._valid_questions(standard, [q_type for q_type, _ in plan], results, errors)
+
+    def _valid_questions(
+        self,
+        standard: Dict,
+        question_types: List[QuestionType],
+        results: List[Any],
+        errors: Optional[List[str]] = None
+    ) -> List[QuizQuestion]:
+        """Build questions from a multi-question response, skipping only the entries that fail the schema"""
+        questions = []
+        for i, (q_type, result) in enumerate(zip(question_types, results)):
+            try:
+                questions.append(self._question_from_result(standard, q_type, _check_response(result, QuestionSchema, QUESTION_FIELDS)))
+            except ResponseSchemaError as e:
+                print(f"Skipping question {i+1} for {standard.get('id')}: it did not match the schema ({e})")
+                if errors is not None:
+                    errors.append(f"Question {i+1}: {e}")
+        return questions
+
     def generate_question(
         self,
         standard: Dict,
@@ -165,56 +1198,157 @@ Respond in JSON format:
         Returns:
             QuizQuestion object
         """
-        objective_text = ""
-        if objective:
-            objective_text = f"\nSpecific Objective: {objective.get('text', '')}"
+        return self._chat_parsed(
+            self._question_messages(standard, grade_level, question_type, objective),
+            temperature=0.7,
+            label=f"{question_type.value} question for {standard.get('id')}",
+            parse=lambda content: self._parse_question(standard, question_type, content)
+        )
 
-        prompt = f"""Create an age-appropriate quiz question for the following educational standard.
+    async def generate_question_async(
+        self,
+        standard: Dict,
+        grade_level: str,
+        question_type: QuestionType,
+        objective: Optional[Dict] = None
+    ) -> QuizQuestion:
+        """Async version of generate_question"""
+        return await self._post_chat_parsed(
+            self._question_messages(standard, grade_level, question_type, objective),
+            temperature=0.7,
+            label=f"{question_type.value} question for {standard.get('id')}",
+            parse=lambda content: self._parse_question(standard, question_type, content)
+        )
 
-Grade Level: {grade_level}
-Standard ID: {standard.get('id', 'N/A')}
-Standard Statement: {standard.get('statement', 'N/A')}{objective_text}
+    def _question_plan(
+        self,
+        standard: Dict,
+        num_questions: int,
+        question_types: List[QuestionType]
+    ) -> List[Tuple[QuestionType, Optional[Dict]]]:
+        """Pair each question to generate with its type and the objective it targets"""
+        objectives = standard.get('knowledge_and_skills', {}).get('objectives', [])
+        return [
+            (question_types[i], objectives[i] if i < len(objectives) else None)
+            for i in range(min(num_questions, len(question_types)))
+        ]
+
+    def _question_types(self, names: List[Any]) -> List[QuestionType]:
+        """Convert type names from the model, mapping any type we cannot generate to short answer"""
+        known_types = {q_type.value for q_type in QuestionType}
+        return [QuestionType(name if name in known_types else QuestionType.SHORT_ANSWER.value) for name in names]
+
+    async def _cancel_tasks(self, tasks: List[asyncio.Task]):
+        """Cancel speculative tasks and wait for them to unwind"""
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _standard_result(
+        self,
+        standard: Dict,
+        assessment: StandardAssessment,
+        questions: List[Dict],
+        errors: List[str]
+    ) -> Dict[str, Any]:
+        """Result for a standard; 'errors' lists questions that failed after all retries"""
+        result = {
+            "standard_id": standard.get('id'),
+            "assessment": assessment.to_dict(),
+            "questions": questions
+        }
+        if errors:
+            result["errors"] = errors
+        return result
 
-Question Type: {question_type.value}
+    def _not_feasible_result(self, standard: Dict, assessment: StandardAssessment) -> Dict[str, Any]:
+        """Result for a standard that cannot be assessed with text questions"""
+        return {
+            "standard_id": standard.get('id'),
+            "assessment": assessment.to_dict(),
+            "questions": [],
+            "message": "Standard not suitable for text-based assessment"
+        }
 
-Requirements:
-1. Use age-appropriate vocabulary and sentence structure for {grade_level}
-2. Question should directly assess understanding of the standard
-3. For multiple choice: provide 4 options with one correct answer
-4. For fill in blank: indicate the blank with _____
-5. Include a brief explanation of why the answer is correct
-6. Rate difficulty as: easy, medium, or hard
+    def _bundle_messages(
+        self,
+        standard: Dict,
+        grade_level: str,
+        num_questions: int,
+        question_types: Optional[List[QuestionType]]
+    ) -> List[Dict[str, str]]:
+        """Build the chat messages for a combined assessment and question request"""
+        if question_types is None:
+            listing = f"Choose the {num_questions} most suitable question types yourself."
+        else:
+            listing = "\n".join(
+                f"{i}. {q_type.value}" + (f" (Specific Objective: {objective.get('text', '')})" if objective else "")
+                for i, (q_type, objective) in enumerate(self._question_plan(standard, num_questions, question_types), 1)
+            )
+
+        prompt = BUNDLE_PROMPT_TEMPLATE.format_map({
+            "count": num_questions if question_types is None else min(num_questions, len(question_types)),
+            "grade_level": grade_level,
+            "standard_details": self._standard_details(standard),
+            "listing": listing
+        })
+
+        return [
+            {"role": "system", "content": _system_prompt_for_grade(BUNDLE_SYSTEM_PROMPT, grade_level)},
+            {"role": "user", "content": prompt}
+        ]
+
+    def generate_standard_bundle(
+        self,
+        standard: Dict,
+        grade_level: str,
+        num_questions: int = 3,
+        question_types: Optional[List[QuestionType]] = None
+    ) -> Dict[str, Any]:
+        """
+        Assess a standard and generate its questions in a single request.
 
-Respond in JSON format:
-{{
-    "question_text": "the question",
-    "correct_answer": "the correct answer",
-    "options": ["option1", "option2", "option3", "option4"],  // only for multiple choice
-    "explanation": "why this answer is correct",
-    "difficulty_level": "easy|medium|hard"
-}}"""
-
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": "You are an expert elementary and secondary education teacher who creates engaging, age-appropriate quiz questions."},
-                {"role": "user", "content": prompt}
-            ],
-            response_format={"type": "json_object"},
-            temperature=0.7
+        Args:
+            standard: The standard object
+            grade_level: Grade level
+            num_questions: Number of questions to generate
+            question_types: List of question types to use (if None, the model chooses)
+
+        Returns:
+            Dictionary with assessment and generated questions, like generate_questions_for_standard
+        """
+        def parse(content: str) -> Tuple[StandardAssessment, List[Any]]:
+            # The assessment must be valid; questions are checked one by one below
+            result = _decode_object(content, 'questions')
+            assessment = self._assessment_from_result(
+                standard, _check_response(result.get('assessment'), AssessmentSchema, ASSESSMENT_FIELDS)
+            )
+            return assessment, result['questions']
+
+        assessment, results = self._chat_parsed(
+            self._bundle_messages(standard, grade_level, num_questions, question_types),
+            temperature=0.5,
+            label=f"bundle for {standard.get('id')}",
+            parse=parse
         )
 
-        result = json.loads(response.choices[0].message.content)
+        if assessment.feasibility == TextFeasibility.NOT_FEASIBLE.value:
+            return self._not_feasible_result(standard, assessment)
 
-        return QuizQuestion(
-            standard_id=standard.get('id', 'N/A'),
-            question_type=question_type.value,
-            question_text=result['question_text'],
-            correct_answer=result['correct_answer'],
-            options=result.get('options'),
-            explanation=result.get('explanation'),
-            difficulty_level=result.get('difficulty_level')
-        )
+        if question_types is None:
+            # The model reports the type it picked on each question; malformed entries are skipped later
+            question_types = self._question_types([
+                q.get('question_type') if isinstance(q, dict) else None
+                for q in results[:num_questions]
+            ])
+
+        errors = []
+        questions = [
+            question.to_dict()
+            for question in self._valid_questions(standard, question_types[:num_questions], results, errors)
+        ]
+
+        return self._standard_result(standard, assessment, questions, errors)
 
     def generate_questions_for_standard(
         self,
@@ -239,98 +1373,502 @@ Respond in JSON format:
         assessment = self.assess_text_feasibility(standard, grade_level)
 
         if assessment.feasibility == TextFeasibility.NOT_FEASIBLE.value:
-            return {
-                "standard_id": standard.get('id'),
-                "assessment": asdict(assessment),
-                "questions": [],
-                "message": "Standard not suitable for text-based assessment"
-            }
+            return self._not_feasible_result(standard, assessment)
 
         # Determine question types to use
         if question_types is None:
-            question_types = [QuestionType(qt) for qt in assessment.suggested_question_types[:num_questions]]
+            question_types = self._question_types(assessment.suggested_question_types[:num_questions])
 
-        # Generate questions
+        # Generate all questions in one request
         questions = []
-        objectives = standard.get('knowledge_and_skills', {}).get('objectives', [])
+        errors = []
+        try:
+            for question in self.generate_questions_bulk(standard, grade_level, question_types, num_questions, errors):
+                questions.append(question.to_dict())
+        except Exception as e:
+            print(f"Error generating questions for {standard.get('id')}: {str(e)}")
+            errors.append(str(e))
 
-        for i in range(min(num_questions, len(question_types))):
-            q_type = question_types[i]
-            objective = objectives[i] if i < len(objectives) else None
+        return self._standard_result(standard, assessment, questions, errors)
 
-            try:
-                question = self.generate_question(standard, grade_level, q_type, objective)
-                questions.append(question.to_dict())
-            except Exception as e:
-                print(f"Error generating question {i+1}: {str(e)}")
+    async def generate_questions_for_standard_async(
+        self,
+        standard: Dict,
+        grade_level: str,
+        num_questions: int = 3,
+        question_types: Optional[List[QuestionType]] = None
+    ) -> Dict[str, Any]:
+        """
+        Async version of generate_questions_for_standard.
 
-        return {
-            "standard_id": standard.get('id'),
-            "assessment": asdict(assessment),
-            "questions": questions
-        }
+        When question_types is given, the questions are requested concurrently with
+        the feasibility assessment and discarded if the standard is not feasible,
+        so the common (feasible) case costs one round-trip of latency instead of two.
+        """
+        # One HTTP session for the assessment and all question requests
+        async with self._session_scope():
+            question_tasks = []
+            if question_types is not None:
+                question_tasks = [
+                    asyncio.create_task(self.generate_question_async(standard, grade_level, q_type, objective))
+                    for q_type, objective in self._question_plan(standard, num_questions, question_types)
+                ]
+
+            try:
+                assessment = await self.assess_text_feasibility_async(standard, grade_level)
+            except BaseException:
+                await self._cancel_tasks(question_tasks)
+                raise
+
+            if assessment.feasibility == TextFeasibility.NOT_FEASIBLE.value:
+                await self._cancel_tasks(question_tasks)
+                return self._not_feasible_result(standard, assessment)
+
+            if question_types is None:
+                question_types = self._question_types(assessment.suggested_question_types[:num_questions])
+                question_tasks = [
+                    asyncio.create_task(self.generate_question_async(standard, grade_level, q_type, objective))
+                    for q_type, objective in self._question_plan(standard, num_questions, question_types)
+                ]
+
+            questions = []
+            errors = []
+            for i, result in enumerate(await asyncio.gather(*question_tasks, return_exceptions=True)):
+                if isinstance(result, Exception):
+                    print(f"Error generating question {i+1} for {standard.get('id')}: {str(result)}")
+                    errors.append(f"Question {i+1}: {str(result)}")
+                else:
+                    questions.append(result.to_dict())
+
+            return self._standard_result(standard, assessment, questions, errors)
+
+    def _select_standards(self, document: Dict, max_standards: Optional[int] = None) -> List[Dict]:
+        """Collect the standards of a document in order, up to max_standards"""
+        standards = self._standards_of(document)
+        return standards[:max_standards] if max_standards else standards
 
     def process_document(
         self,
         document: Dict,
         max_standards: Optional[int] = None,
-        questions_per_standard: int = 3
+        questions_per_standard: int = 3,
+        max_concurrency: int = 10
     ) -> Dict[str, Any]:
         """
         Process an entire SOL document and generate questions for all standards.
 
+        Standards are processed concurrently on worker threads using the sync
+        client, so this also works where an event loop is already running.
+
         Args:
             document: The document object from SOL JSON
             max_standards: Maximum number of standards to process (None for all)
             questions_per_standard: Number of questions per standard
+            max_concurrency: Maximum number of standards processed at once
 
         Returns:
             Dictionary with all generated content
         """
         grade_level = document.get('grade_level', 'Unknown')
-        course_name = document.get('course_name', 'Unknown')
 
+        def process_standard(standard: Dict) -> Dict[str, Any]:
+            print(f"Processing {standard.get('id')}...")
+            return self.generate_questions_for_standard(standard, grade_level, questions_per_standard)
+
+        # map preserves input order, so results line up with the document
+        standard_results = self._thread_pool(max_concurrency).map(
+            process_standard,
+            self._select_standards(document, max_standards)
+        )
+        return self._document_results(document, standard_results)
+
+    async def process_document_async(
+        self,
+        document: Dict,
+        max_standards: Optional[int] = None,
+        questions_per_standard: int = 3,
+        max_concurrency: int = 10
+    ) -> Dict[str, Any]:
+        """Async version of process_document; standards are processed concurrently"""
+        grade_level = document.get('grade_level', 'Unknown')
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        # gather preserves input order, so results line up with the document
+        async with self._session_scope():
+            standard_results = await asyncio.gather(*[
+                self._process_standard_bounded(semaphore, standard, grade_level, questions_per_standard)
+                for standard in self._select_standards(document, max_standards)
+            ])
+
+        return self._document_results(document, standard_results)
+
+    def _thread_pool(self, max_workers: int) -> ThreadPoolExecutor:
+        """The shared worker threads for this size"""
+        # Pools are never shut down while in use: another caller may still be
+        # submitting to one, so a new size gets its own pool instead of replacing it
+        with self._executors_lock:
+            executor = self._executors.get(max_workers)
+            if executor is None:
+                executor = self._executors[max_workers] = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sol-quiz")
+            return executor
+
+    def _document_results(self, document: Dict, standard_results) -> Dict[str, Any]:
+        """Collect per-standard results into the process_document output structure"""
         results = {
-            "document_info": {
-                "title": document.get('title'),
-                "grade_level": grade_level,
-                "course_name": course_name,
-                "year": document.get('year')
-            },
+            "document_info": self._document_info(document),
             "standards_processed": 0,
             "total_questions_generated": 0,
             "standards": []
         }
 
-        count = 0
-        for strand in document.get('strands', []):
-            for standard in strand.get('standards', []):
-                if max_standards and count >= max_standards:
-                    break
+        for result in standard_results:
+            results['standards'].append(result)
+            results['standards_processed'] += 1
+            results['total_questions_generated'] += len(result.get('questions', []))
 
-                print(f"Processing {standard.get('id')}...")
+        return results
 
-                result = self.generate_questions_for_standard(
-                    standard,
-                    grade_level,
-                    questions_per_standard
-                )
+    def _document_info(self, document: Dict) -> Dict[str, Any]:
+        """Identifying fields of a document, as recorded with its results"""
+        return {
+            "title": document.get('title'),
+            "grade_level": document.get('grade_level', 'Unknown'),
+            "course_name": document.get('course_name', 'Unknown'),
+            "year": document.get('year')
+        }
+
+    def _document_key(self, document_info: Dict[str, Any]) -> Tuple:
+        """Hashable key telling documents apart, since standard IDs repeat across documents"""
+        return tuple(document_info.get(field) for field in ("title", "grade_level", "course_name", "year"))
+
+    async def _process_standard_bounded(
+        self,
+        semaphore: asyncio.Semaphore,
+        standard: Dict,
+        grade_level: str,
+        questions_per_standard: int
+    ) -> Dict[str, Any]:
+        """Generate questions for one standard once a semaphore slot is free"""
+        async with semaphore:
+            print(f"Processing {standard.get('id')}...")
+            return await self.generate_questions_for_standard_async(
+                standard,
+                grade_level,
+                questions_per_standard
+            )
+
+    def process_document_streaming(
+        self,
+        document: Dict,
+        output_path: str,
+        max_standards: Optional[int] = None,
+        questions_per_standard: int = 3,
+        max_concurrency: int = 10
+    ) -> Dict[str, Any]:
+        """
+        Process a document, appending each standard's result to a JSONL file.
 
-                results['standards'].append(result)
-                results['standards_processed'] += 1
-                results['total_questions_generated'] += len(result.get('questions', []))
+        Every result is written as soon as it finishes, so memory does not grow
+        with the document and an interrupted run can be restarted: standards
+        of this document already completed in output_path are skipped. Each line
+        carries the document's document_info, so several documents can share
+        one file. Standards written with errors, or without questions although
+        feasible, are retried and written again; keep the last line for each.
 
-                count += 1
+        Args:
+            document: The document object from SOL JSON
+            output_path: JSONL file to append results to
+            max_standards: Maximum number of standards to process (None for all)
+            questions_per_standard: Number of questions per standard
+            max_concurrency: Maximum number of standards processed at once
 
-            if max_standards and count >= max_standards:
+        Returns:
+            Summary counts for this run (the results themselves are on disk)
+        """
+        return asyncio.run(self.process_document_streaming_async(
+            document,
+            output_path,
+            max_standards=max_standards,
+            questions_per_standard=questions_per_standard,
+            max_concurrency=max_concurrency
+        ))
+
+    async def process_document_streaming_async(
+        self,
+        document: Dict,
+        output_path: str,
+        max_standards: Optional[int] = None,
+        questions_per_standard: int = 3,
+        max_concurrency: int = 10
+    ) -> Dict[str, Any]:
+        """Async version of process_document_streaming"""
+        grade_level = document.get('grade_level', 'Unknown')
+        document_info = self._document_info(document)
+        done = self._processed_standard_ids(output_path).get(self._document_key(document_info), set())
+        selected = self._select_standards(document, max_standards)
+        standards = [standard for standard in selected if standard.get('id') not in done]
+
+        summary = {
+            "output_path": output_path,
+            "standards_skipped": len(selected) - len(standards),
+            "standards_processed": 0,
+            "total_questions_generated": 0
+        }
+        if summary['standards_skipped']:
+            print(f"Skipping {summary['standards_skipped']} standards already in {output_path}")
+        if not standards:
+            return summary
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        with open(output_path, 'ab') as f:
+            # A crash mid-write can leave a partial last line; start on a fresh one
+            if f.tell() and not self._ends_with_newline(output_path):
+                f.write(b"\n")
+
+            async with self._session_scope():
+                tasks = [
+                    asyncio.ensure_future(self._process_standard_bounded(
+                        semaphore, standard, grade_level, questions_per_standard
+                    ))
+                    for standard in standards
+                ]
+                try:
+                    # Written in completion order; each line carries its document_info and standard_id
+                    for next_done in asyncio.as_completed(tasks):
+                        result = await next_done
+                        f.write(self._jsonl_line({"document_info": document_info, **result}))
+                        f.flush()
+                        summary['standards_processed'] += 1
+                        summary['total_questions_generated'] += len(result.get('questions', []))
+                finally:
+                    await self._cancel_tasks(tasks)
+
+        return summary
+
+    def _jsonl_line(self, data: Dict) -> bytes:
+        """Serialize one result as a JSONL line"""
+        return json_utils.dumps_line(data)
+
+    def _ends_with_newline(self, path: str) -> bool:
+        """Check the last byte of a file"""
+        with open(path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def _is_complete(self, result: Dict[str, Any]) -> bool:
+        """Whether a written result needs no retry: no failed questions, and questions unless not feasible"""
+        if result.get('errors'):
+            return False
+        feasibility = (result.get('assessment') or {}).get('feasibility')
+        return bool(result.get('questions')) or feasibility == TextFeasibility.NOT_FEASIBLE.value
+
+    def _processed_standard_ids(self, path: str) -> Dict[Tuple, set]:
+        """Standard IDs already written to a JSONL results file, by document key"""
+        done = defaultdict(set)
+        if not os.path.exists(path):
+            return done
+        with open(path, 'rb') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    result = json_utils.loads(line)
+                except ValueError:
+                    # Truncated line from an interrupted run; that standard is redone
+                    continue
+                if result.get('standard_id') and self._is_complete(result):
+                    document_key = self._document_key(result.get('document_info') or {})
+                    done[document_key].add(result['standard_id'])
+        return done
+
+    def _batch_line(self, custom_id: str, messages: List[Dict[str, str]], temperature: float) -> bytes:
+        """One JSONL request line for the Batch API"""
+        line = {
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": self._chat_body(messages, temperature)
+        }
+        return json_utils.dumps_line(line)
+
+    def submit_batch(self, lines: List[bytes]) -> str:
+        """
+        Upload JSONL request lines and start a Batch API job.
+
+        Args:
+            lines: Request lines built with _batch_line
+
+        Returns:
+            The batch ID
+        """
+        batch_file = self.client.files.create(file=("batch.jsonl", b"".join(lines)), purpose="batch")
+        batch = self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        print(f"Submitted batch {batch.id} ({len(lines)} requests)")
+        return batch.id
+
+    def wait_for_batch(
+        self,
+        batch_id: str,
+        poll_interval: float = 30,
+        failures: Optional[Dict[str, str]] = None
+    ) -> Dict[str, str]:
+        """
+        Poll a batch until it finishes and collect its responses.
+
+        Args:
+            batch_id: ID returned by submit_batch
+            poll_interval: Seconds between status checks
+            failures: Optional dict to fill with custom_id -> reason for every
+                request that failed (from the output and error files)
+
+        Returns:
+            Dictionary mapping custom_id to the message content of each successful request
+        """
+        while True:
+            batch = self.client.batches.retrieve(batch_id)
+            if batch.status in ("completed", "failed", "expired", "cancelled"):
                 break
+            print(f"Batch {batch_id}: {batch.status}...")
+            time.sleep(poll_interval)
+
+        if batch.status != "completed":
+            raise RuntimeError(f"Batch {batch_id} ended with status {batch.status}")
+
+        contents = {}
+        # Failed requests can appear in either file: non-200 responses in the
+        # output file, requests that never got a response in the error file
+        for file_id in (batch.output_file_id, getattr(batch, "error_file_id", None)):
+            if not file_id:
+                continue
+            for line in self.client.files.content(file_id).text.splitlines():
+                if not line.strip():
+                    continue
+                item = json_utils.loads(line)
+                response = item.get("response") or {}
+                if response.get("status_code") == 200:
+                    contents[item["custom_id"]] = response["body"]["choices"][0]["message"]["content"]
+                else:
+                    reason = str(item.get("error") or response.get("body") or response)
+                    print(f"Batch request {item['custom_id']} failed: {reason}")
+                    if failures is not None:
+                        failures[item["custom_id"]] = reason
+        return contents
+
+    def process_document_batch(
+        self,
+        document: Dict,
+        max_standards: Optional[int] = None,
+        questions_per_standard: int = 3,
+        poll_interval: float = 30
+    ) -> Dict[str, Any]:
+        """
+        Process a document through the OpenAI Batch API (half the cost, results within 24h).
+
+        Runs two batches: feasibility assessments first, then questions for the
+        standards that can be assessed with text. Returns the same structure as
+        process_document, plus 'errors' for standards whose assessment request
+        failed; failed question requests are listed in each standard's 'errors'.
+        """
+        grade_level = document.get('grade_level', 'Unknown')
+        standards = self._select_standards(document, max_standards)
+
+        results = {
+            "document_info": self._document_info(document),
+            "standards_processed": 0,
+            "total_questions_generated": 0,
+            "standards": [],
+            # Standards left out because their assessment request failed
+            "errors": []
+        }
+
+        # Pass 1: assess every standard that is not already cached. Requests are
+        # keyed by position, since standard IDs can repeat within a document and
+        # the Batch API rejects duplicate custom_ids.
+        assessments = {}
+        for n, standard in enumerate(standards):
+            cached = self._cached_assessment(standard, grade_level)
+            if cached is not None:
+                assessments[n] = cached
+
+        failures = {}
+        to_assess = [n for n in range(len(standards)) if n not in assessments]
+        assessed = self.wait_for_batch(self.submit_batch([
+            self._batch_line(f"{n}:{standards[n].get('id')}::assess", self._assessment_messages(standards[n], grade_level), 0.3)
+            for n in to_assess
+        ]), poll_interval, failures) if to_assess else {}
+
+        for n in to_assess:
+            standard = standards[n]
+            custom_id = f"{n}:{standard.get('id')}::assess"
+            content = assessed.get(custom_id)
+            if content is None:
+                error = failures.get(custom_id, "no response in the batch output")
+            else:
+                try:
+                    assessments[n] = self._store_assessment(standard, grade_level, self._parse_assessment(standard, content))
+                    continue
+                except ResponseSchemaError as e:
+                    error = f"did not match the schema ({e})"
+            print(f"Skipping {standard.get('id')}: assessment failed: {error}")
+            results['errors'].append(f"{standard.get('id')} assessment: {error}")
+
+        # Pass 2: generate questions for the feasible standards
+        plans = {}
+        lines = []
+        for n, standard in enumerate(standards):
+            assessment = assessments.get(n)
+            if assessment is None or assessment.feasibility == TextFeasibility.NOT_FEASIBLE.value:
+                continue
+            question_types = self._question_types(assessment.suggested_question_types[:questions_per_standard])
+            plans[n] = self._question_plan(standard, questions_per_standard, question_types)
+            for i, (q_type, objective) in enumerate(plans[n]):
+                lines.append(self._batch_line(
+                    f"{n}:{standard.get('id')}::q{i}",
+                    self._question_messages(standard, grade_level, q_type, objective),
+                    0.7
+                ))
+
+        generated = self.wait_for_batch(self.submit_batch(lines), poll_interval, failures) if lines else {}
+
+        for n, standard in enumerate(standards):
+            assessment = assessments.get(n)
+            if assessment is None:
+                continue
+            if n not in plans:
+                result = self._not_feasible_result(standard, assessment)
+            else:
+                questions = []
+                errors = []
+                for i, (q_type, _) in enumerate(plans[n]):
+                    custom_id = f"{n}:{standard.get('id')}::q{i}"
+                    content = generated.get(custom_id)
+                    if content is None:
+                        error = failures.get(custom_id, "no response in the batch output")
+                    else:
+                        try:
+                            questions.append(self._parse_question(standard, q_type, content).to_dict())
+                            continue
+                        except ResponseSchemaError as e:
+                            error = f"did not match the schema ({e})"
+                    print(f"Skipping question {i+1} for {standard.get('id')}: {error}")
+                    errors.append(f"Question {i+1}: {error}")
+                result = self._standard_result(standard, assessment, questions, errors)
+
+            results['standards'].append(result)
+            results['standards_processed'] += 1
+            results['total_questions_generated'] += len(result['questions'])
 
         return results
 
     def save_results(self, results: Dict, output_file: str):
         """Save generated questions to a JSON file"""
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
+        with open(output_file, 'wb') as f:
+            f.write(json_utils.dumps(results))
         print(f"Results saved to {output_file}")
 
 
@@ -3,9 +3,134 @@ Helper functions for the Streamlit UI
 Utilities for data formatting, validation, and processing
 """
 
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 import json
+import os
+import re
+import sys
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+import json_utils
+
+try:
+    import jinja2
+except ImportError:  # jinja2 is optional; only the Moodle and Canvas exports need it
+    jinja2 = None
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; histograms then fall back to np.bincount
+    njit = None
+
+try:
+    import hyperscan
+except ImportError:  # hyperscan is optional; multi-term search then uses re
+    hyperscan = None
+
+try:
+    import msgspec
+except ImportError:  # msgspec is optional; only load_questions_structs needs it
+    msgspec = None
+
+
+# Display lookups: known value -> position in a tuple whose last entry is the fallback
+_FEASIBILITY_INDEX = {"feasible": 0, "partially_feasible": 1, "not_feasible": 2}
+_FEASIBILITY_COLORS = ("#28a745", "#ffc107", "#dc3545", "#6c757d")
+
+_DIFFICULTY_INDEX = {"easy": 0, "medium": 1, "hard": 2}
+_DIFFICULTY_EMOJIS = ("🟢", "🟡", "🔴", "⚪")
+
+_QUESTION_TYPE_INDEX = {"multiple_choice": 0, "fill_in_blank": 1, "true_false": 2, "short_answer": 3}
+_QUESTION_TYPE_ICONS = ("🔘", "📝", "✓✗", "💭", "❓")
+
+
+# Short, heavily repeated values; interning shares one string object per value
+_INTERNED_FIELDS = ('question_type', 'difficulty_level', 'feasibility', 'standard_id')
+
+# Enum-like values stored lowercase, so filters compare them without normalizing
+_LOWERCASED_FIELDS = frozenset(('question_type', 'difficulty_level', 'feasibility'))
+
+
+def _intern_enums(obj: Dict) -> Dict:
+    """json object_hook that interns the enum-like string fields of each object, lowercasing enum values"""
+    for field in _INTERNED_FIELDS:
+        value = obj.get(field)
+        if type(value) is str:
+            obj[field] = sys.intern(value.lower() if field in _LOWERCASED_FIELDS else value)
+    return obj
+
+
+def load_questions_data(source: Union[str, bytes]) -> Dict:
+    """
+    Parse saved questions data, interning repeated enum-like strings
+
+    Question types, difficulty levels and feasibilities are lowercased, the
+    form the filters compare against.
+
+    Args:
+        source: JSON text or bytes
+
+    Returns:
+        Questions data
+    """
+    return json.loads(source, object_hook=_intern_enums)
+
+
+if msgspec is not None:
+    class Assessment(msgspec.Struct):
+        """Feasibility assessment of a standard"""
+        feasibility: str = 'unknown'
+        reasoning: str = ''
+
+    class Question(msgspec.Struct):
+        """One generated question"""
+        question_text: str = ''
+        correct_answer: Union[str, bool, int, float] = ''
+        question_type: str = 'unknown'
+        difficulty_level: str = 'unknown'
+        options: Optional[List[Any]] = None
+        explanation: Optional[str] = None
+
+    class Standard(msgspec.Struct):
+        """A standard with its assessment and questions"""
+        standard_id: str
+        assessment: Assessment = msgspec.field(default_factory=Assessment)
+        questions: List[Question] = []
+
+    class Document(msgspec.Struct):
+        """Results for one document"""
+        document_info: Dict[str, Any] = {}
+        standards_processed: int = 0
+        total_questions_generated: int = 0
+        standards: List[Standard] = []
+else:
+    Assessment = Question = Standard = Document = None
+
+
+def load_questions_structs(source: Union[str, bytes]) -> Dict[str, "Document"]:
+    """
+    Parse saved questions data straight into msgspec Structs
+
+    Decoding and attribute access are both faster than with dicts, which
+    suits read-only work such as calculate_statistics on large files. Fields
+    without a Struct attribute are dropped, so keep load_questions_data for
+    data that will be edited or saved again.
+
+    Args:
+        source: JSON text or bytes
+
+    Returns:
+        {doc_key: Document}
+    """
+    if msgspec is None:
+        raise ImportError("msgspec is required to load questions as structs: pip install msgspec")
+    return msgspec.json.decode(source, type=Dict[str, Document])
 
 
 def format_standard_id(standard_id: str) -> str:
@@ -15,22 +140,19 @@ def format_standard_id(standard_id: str) -> str:
 
 def get_feasibility_color(feasibility: str) -> str:
     """Get color code for feasibility status"""
-    colors = {
-        "feasible": "#28a745",
-        "partially_feasible": "#ffc107",
-        "not_feasible": "#dc3545"
-    }
-    return colors.get(feasibility, "#6c757d")
+    return _FEASIBILITY_COLORS[_FEASIBILITY_INDEX.get(feasibility, 3)]
 
 
 def get_difficulty_emoji(difficulty: str) -> str:
     """Get emoji for difficulty level"""
-    emojis = {
-        "easy": "🟢",
-        "medium": "🟡",
-        "hard": "🔴"
-    }
-    return emojis.get(difficulty.lower(), "⚪")
+    # Stored difficulties are normally lowercase already; only normalize on a miss
+    position = _DIFFICULTY_INDEX.get(difficulty)
+    if position is None:
+        position = _DIFFICULTY_INDEX.get(difficulty.lower(), 3)
+    return _DIFFICULTY_EMOJIS[position]
+
+
+_REQUIRED_QUESTION_FIELDS = ('question_text', 'correct_answer', 'question_type')
 
 
 def validate_question(question: Dict) -> Tuple[bool, Optional[str]]:
@@ -40,28 +162,218 @@ def validate_question(question: Dict) -> Tuple[bool, Optional[str]]:
     Returns:
         Tuple of (is_valid, error_message)
     """
-    required_fields = ['question_text', 'correct_answer', 'question_type']
-
-    for field in required_fields:
+    for field in _REQUIRED_QUESTION_FIELDS:
         if field not in question:
             return False, f"Missing required field: {field}"
 
     # Validate multiple choice questions have options
     if question['question_type'] == 'multiple_choice':
-        if 'options' not in question or not question['options']:
+        options = question.get('options')
+        if not options:
             return False, "Multiple choice questions must have options"
-        if len(question['options']) < 2:
+        if len(options) < 2:
             return False, "Multiple choice must have at least 2 options"
-        if question['correct_answer'] not in question['options']:
+        if question['correct_answer'] not in options:
             return False, "Correct answer must be in options list"
 
     return True, None
 
 
-def calculate_statistics(questions_data: Dict) -> Dict:
+def standards_of(doc_data: Dict) -> Iterable[Dict]:
+    """
+    The standards of a document, in order
+
+    A document's 'standards' may be a list or a dict keyed by standard_id
+    (see index_standards); every helper in this module accepts both.
+    """
+    standards = doc_data.get('standards', [])
+    return standards.values() if isinstance(standards, dict) else standards
+
+
+def _with_standards(doc_data: Dict, standards: List[Dict]) -> Dict:
+    """Copy of a document holding the given standards, in the document's own form"""
+    if isinstance(doc_data.get('standards'), dict):
+        return {**doc_data, 'standards': {std_data['standard_id']: std_data for std_data in standards}}
+    return {**doc_data, 'standards': standards}
+
+
+def index_standards(questions_data: Dict) -> Dict:
+    """
+    Key each document's standards by standard_id
+
+    Merging into indexed data is a dict lookup per standard instead of
+    rebuilding an index on every merge_question_data call.
+
+    Returns:
+        Questions data whose 'standards' are {standard_id: std_data}, in order
+    """
+    return {
+        doc_key: {**doc_data, 'standards': {std_data['standard_id']: std_data for std_data in standards_of(doc_data)}}
+        for doc_key, doc_data in questions_data.items()
+    }
+
+
+def iter_standards(questions_data: Dict) -> Iterator[Tuple[str, Dict]]:
+    """Yield (doc_key, std_data) for every standard in questions data"""
+    for doc_key, doc_data in questions_data.items():
+        for std_data in standards_of(doc_data):
+            yield doc_key, std_data
+
+
+# Largest number of distinct questions whose search text is kept
+SEARCH_TEXT_CACHE_SIZE = 65536
+
+# Fields joined with a unit separator so a search term cannot match across two fields
+_SEARCH_SEPARATOR = '\x1f'
+
+
+@lru_cache(maxsize=SEARCH_TEXT_CACHE_SIZE)
+def _search_text(question_text: str, correct_answer: str, options: Tuple[str, ...]) -> str:
+    return _SEARCH_SEPARATOR.join((question_text, correct_answer, *options)).lower()
+
+
+def _question_search_text(q: Dict) -> str:
+    """Lowercase text a question is searched by, cached by content so edited questions need no invalidation"""
+    return _search_text(q.get('question_text', ''), str(q.get('correct_answer', '')), tuple(q.get('options') or ()))
+
+
+def _standard_search_text(std_data: Dict) -> str:
+    return std_data.get('standard_id', '').lower()
+
+
+def _encode(values: List[str]) -> Tuple[np.ndarray, List[str]]:
+    """Encode repeated strings as small integer codes, returning (codes, names by code)"""
+    lookup = {}
+    codes = [lookup.setdefault(value, len(lookup)) for value in values]
+    return np.array(codes, dtype=np.uint8 if len(lookup) <= 256 else np.intp), list(lookup)
+
+
+def _categorical_values(questions_data: Dict) -> Tuple[List[str], List[str], List[str]]:
+    """Collect (question types, difficulty levels, feasibilities) in one traversal"""
+    types = []
+    difficulties = []
+    feasibilities = []
+
+    if Document is not None and isinstance(next(iter(questions_data.values()), None), Document):
+        # Structs from load_questions_structs; defaults already fill missing fields
+        for doc_data in questions_data.values():
+            for std_data in doc_data.standards:
+                feasibilities.append(std_data.assessment.feasibility)
+                questions = std_data.questions
+                types.extend([q.question_type for q in questions])
+                difficulties.extend([q.difficulty_level for q in questions])
+        return types, difficulties, feasibilities
+
+    for _, std_data in iter_standards(questions_data):
+        feasibilities.append(std_data.get('assessment', {}).get('feasibility', 'unknown'))
+        for q in std_data.get('questions', []):
+            types.append(q.get('question_type', 'unknown'))
+            difficulties.append(q.get('difficulty_level', 'unknown'))
+
+    return types, difficulties, feasibilities
+
+
+def question_codes(questions_data: Dict) -> Dict[str, Tuple[np.ndarray, List[str]]]:
+    """
+    Struct-of-arrays view of the categorical fields in questions data
+
+    Build it once after loading and pass it to calculate_statistics to skip
+    walking the nested data on every refresh.
+
+    Returns:
+        {'question_type': (codes, names), 'difficulty_level': (codes, names),
+        'feasibility': (codes, names)}; feasibility has one code per standard,
+        the others one per question
+    """
+    types, difficulties, feasibilities = _categorical_values(questions_data)
+    return {
+        'question_type': _encode(types),
+        'difficulty_level': _encode(difficulties),
+        'feasibility': _encode(feasibilities)
+    }
+
+
+# Code arrays at least this long are histogrammed in chunks across threads;
+# below it one pass takes about a millisecond, less than starting the threads
+PARALLEL_HISTOGRAM_MIN = 1_000_000
+
+if njit is not None:
+    @njit(cache=True, nogil=True)
+    def _histogram(codes, n):
+        out = np.zeros(n, np.int64)
+        for i in range(codes.size):
+            out[codes[i]] += 1
+        return out
+else:
+    def _histogram(codes, n):
+        return np.bincount(codes, minlength=n)
+
+
+def _counts(encoded: Tuple[np.ndarray, List[str]]) -> Dict[str, int]:
+    """Count each name from its code array, in order of first appearance"""
+    codes, names = encoded
+    if not names:
+        return {}
+    return dict(zip(names, _parallel_histogram(codes, len(names)).tolist()))
+
+
+def _parallel_histogram(codes: np.ndarray, n: int) -> np.ndarray:
+    """Histogram large code arrays in per-thread chunks, summing the partial counts"""
+    workers = os.cpu_count() or 1
+    # Only the numba histogram releases the GIL; np.bincount would run the chunks serially
+    if njit is None or workers < 2 or codes.size < PARALLEL_HISTOGRAM_MIN:
+        return _histogram(codes, n)
+    chunks = np.array_split(codes, workers)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return sum(pool.map(lambda chunk: _histogram(chunk, n), chunks))
+
+
+def _rebuild(questions_data: Dict, selected: Dict[str, Dict[int, Optional[List[Dict]]]]) -> Dict:
+    """
+    Assemble filtered questions data, keeping document and standard order
+
+    Args:
+        questions_data: The original questions data
+        selected: {doc_key: {id(std_data): kept questions}}; None keeps the standard unchanged
+
+    Returns:
+        Questions data holding only the selected standards and questions;
+        documents and standards that lose nothing are shared, not copied
+    """
+    filtered_data = {}
+
+    for doc_key, kept in selected.items():
+        doc_data = questions_data[doc_key]
+        standards = []
+        unchanged = True
+        for std_data in standards_of(doc_data):
+            if id(std_data) not in kept:
+                unchanged = False
+                continue
+            questions = kept[id(std_data)]
+            if questions is None or len(questions) == len(std_data.get('questions', [])):
+                # Every question kept (selected questions are a subsequence)
+                standards.append(std_data)
+            else:
+                standards.append({**std_data, 'questions': questions})
+                unchanged = False
+        filtered_data[doc_key] = doc_data if unchanged else _with_standards(doc_data, standards)
+
+    return filtered_data
+
+
+def calculate_statistics(
+    questions_data: Dict,
+    codes: Optional[Dict[str, Tuple[np.ndarray, List[str]]]] = None
+) -> Dict:
     """
     Calculate statistics from questions data
 
+    Args:
+        questions_data: Questions data to summarize, as dicts or as
+            Documents from load_questions_structs
+        codes: Precomputed question_codes(questions_data); counted as histograms
+
     Returns:
         Dictionary with various statistics
     """
@@ -80,32 +392,70 @@ def calculate_statistics(questions_data: Dict) -> Dict:
 
     stats['total_documents'] = len(questions_data)
 
-    for doc_data in questions_data.values():
-        standards = doc_data.get('standards', [])
-        stats['total_standards'] += len(standards)
+    if codes is not None:
+        stats['total_standards'] = len(codes['feasibility'][0])
+        stats['total_questions'] = len(codes['question_type'][0])
+        stats['by_type'] = _counts(codes['question_type'])
+        stats['by_difficulty'] = _counts(codes['difficulty_level'])
+        stats['by_feasibility'] = _counts(codes['feasibility'])
+    else:
+        # One C-level count per field beats encoding arrays for a one-off call
+        types, difficulties, feasibilities = _categorical_values(questions_data)
+        stats['total_standards'] = len(feasibilities)
+        stats['total_questions'] = len(types)
+        stats['by_type'] = dict(Counter(types))
+        stats['by_difficulty'] = dict(Counter(difficulties))
+        stats['by_feasibility'] = dict(Counter(feasibilities))
 
-        for std_data in standards:
-            questions = std_data.get('questions', [])
-            stats['total_questions'] += len(questions)
+    if stats['total_standards'] > 0:
+        stats['avg_questions_per_standard'] = stats['total_questions'] / stats['total_standards']
 
-            # Count by type
-            for q in questions:
-                q_type = q.get('question_type', 'unknown')
-                stats['by_type'][q_type] = stats['by_type'].get(q_type, 0) + 1
+    return stats
 
-                # Count by difficulty
-                difficulty = q.get('difficulty_level', 'unknown')
-                stats['by_difficulty'][difficulty] = stats['by_difficulty'].get(difficulty, 0) + 1
 
-            # Count by feasibility
-            assessment = std_data.get('assessment', {})
-            feasibility = assessment.get('feasibility', 'unknown')
-            stats['by_feasibility'][feasibility] = stats['by_feasibility'].get(feasibility, 0) + 1
+def _filter_set(values: Optional[Iterable[str]]) -> Optional[frozenset]:
+    """Lowercase filter values once into a set; None (or empty) means no filter"""
+    if not values:
+        return None
+    return frozenset(value.lower() for value in values)
 
-    if stats['total_standards'] > 0:
-        stats['avg_questions_per_standard'] = stats['total_questions'] / stats['total_standards']
 
-    return stats
+def _allowed(value, allowed: Optional[frozenset]) -> bool:
+    """Case-insensitive filter check; values stored lowercase (see load_questions_data) skip the .lower()"""
+    if allowed is None or value in allowed:
+        return True
+    return type(value) is str and value.lower() in allowed
+
+
+def iter_filtered(
+    questions_data: Dict,
+    question_types: Optional[List[str]] = None,
+    difficulty_levels: Optional[List[str]] = None,
+    feasibility: Optional[List[str]] = None
+) -> Iterator[Tuple[str, Dict, List[Dict]]]:
+    """
+    Lazily yield (doc_key, std_data, matching questions) for each standard with a match
+
+    Nothing is copied, so a page of results can be taken with
+    itertools.islice without filtering the rest of the data.
+    """
+    question_types = _filter_set(question_types)
+    difficulty_levels = _filter_set(difficulty_levels)
+    feasibility = _filter_set(feasibility)
+
+    for doc_key, std_data in iter_standards(questions_data):
+        # Check feasibility filter
+        if not _allowed(std_data.get('assessment', {}).get('feasibility'), feasibility):
+            continue
+
+        filtered_questions = [
+            q for q in std_data.get('questions', [])
+            # Check question type and difficulty filters
+            if _allowed(q.get('question_type'), question_types) and
+               _allowed(q.get('difficulty_level'), difficulty_levels)
+        ]
+        if filtered_questions:
+            yield doc_key, std_data, filtered_questions
 
 
 def filter_questions(
@@ -117,6 +467,9 @@ def filter_questions(
     """
     Filter questions based on criteria
 
+    Use iter_filtered instead when only part of the result is needed.
+    Filters match case-insensitively.
+
     Args:
         questions_data: The questions data to filter
         question_types: List of question types to include
@@ -126,44 +479,158 @@ def filter_questions(
     Returns:
         Filtered questions data
     """
-    filtered_data = {}
+    selected = defaultdict(dict)
+
+    for doc_key, std_data, filtered_questions in iter_filtered(
+        questions_data, question_types, difficulty_levels, feasibility
+    ):
+        selected[doc_key][id(std_data)] = filtered_questions
+
+    return _rebuild(questions_data, selected)
+
+
+MOODLE_XML_TEMPLATE = """<?xml version="1.0" encoding="UTF-8"?>
+<quiz>
+{% for doc_key, items in documents %}
+  <question type="category">
+    <category><text>$course$/SOL/{{ doc_key }}</text></category>
+  </question>
+{% for item in items %}
+  <question type="{{ item.moodle_type }}">
+    <name><text>{{ item.name }}</text></name>
+    <questiontext format="plain_text"><text>{{ item.text }}</text></questiontext>
+    <generalfeedback format="plain_text"><text>{{ item.explanation }}</text></generalfeedback>
+    <defaultgrade>1</defaultgrade>
+{% if item.moodle_type == "multichoice" %}
+    <single>true</single>
+    <shuffleanswers>true</shuffleanswers>
+    <answernumbering>abc</answernumbering>
+{% endif %}
+{% for answer in item.answers %}
+    <answer fraction="{{ 100 if answer.correct else 0 }}"><text>{{ answer.text }}</text></answer>
+{% endfor %}
+  </question>
+{% endfor %}
+{% endfor %}
+</quiz>
+"""
 
-    for doc_key, doc_data in questions_data.items():
-        filtered_standards = []
-
-        for std_data in doc_data.get('standards', []):
-            # Check feasibility filter
-            if feasibility:
-                assessment = std_data.get('assessment', {})
-                if assessment.get('feasibility') not in feasibility:
-                    continue
-
-            # Filter questions
-            filtered_questions = []
-            for q in std_data.get('questions', []):
-                # Check question type filter
-                if question_types and q.get('question_type') not in question_types:
-                    continue
-
-                # Check difficulty filter
-                if difficulty_levels and q.get('difficulty_level') not in difficulty_levels:
-                    continue
-
-                filtered_questions.append(q)
-
-            # Only include standard if it has questions after filtering
-            if filtered_questions:
-                filtered_std = std_data.copy()
-                filtered_std['questions'] = filtered_questions
-                filtered_standards.append(filtered_std)
-
-        # Only include document if it has standards after filtering
-        if filtered_standards:
-            filtered_doc = doc_data.copy()
-            filtered_doc['standards'] = filtered_standards
-            filtered_data[doc_key] = filtered_doc
+CANVAS_QTI_TEMPLATE = """<?xml version="1.0" encoding="UTF-8"?>
+<questestinterop xmlns="http://www.imsglobal.org/xsd/ims_qtiasiv1p2">
+  <assessment ident="sol_quiz" title="SOL Quiz">
+    <section ident="root_section">
+{% for doc_key, items in documents %}
+{% for item in items %}
+      <item ident="{{ item.ident }}" title="{{ item.name }}">
+        <itemmetadata>
+          <qtimetadata>
+            <qtimetadatafield><fieldlabel>question_type</fieldlabel><fieldentry>{{ item.canvas_type }}</fieldentry></qtimetadatafield>
+            <qtimetadatafield><fieldlabel>points_possible</fieldlabel><fieldentry>1</fieldentry></qtimetadatafield>
+          </qtimetadata>
+        </itemmetadata>
+        <presentation>
+          <material><mattext texttype="text/plain">{{ item.text }}</mattext></material>
+{% if item.canvas_type == "short_answer_question" %}
+          <response_str ident="response1" rcardinality="Single">
+            <render_fib><response_label ident="answer1" rshuffle="No"/></render_fib>
+          </response_str>
+{% else %}
+          <response_lid ident="response1" rcardinality="Single">
+            <render_choice>
+{% for answer in item.answers %}
+              <response_label ident="{{ item.ident }}_{{ loop.index }}"><material><mattext texttype="text/plain">{{ answer.text }}</mattext></material></response_label>
+{% endfor %}
+            </render_choice>
+          </response_lid>
+{% endif %}
+        </presentation>
+        <resprocessing>
+          <outcomes><decvar maxvalue="100" minvalue="0" varname="SCORE" vartype="Decimal"/></outcomes>
+{% for answer in item.answers if answer.correct %}
+          <respcondition continue="No">
+{% if item.canvas_type == "short_answer_question" %}
+            <conditionvar><varequal respident="response1">{{ answer.text }}</varequal></conditionvar>
+{% else %}
+            <conditionvar><varequal respident="response1">{{ item.ident }}_{{ answer.index }}</varequal></conditionvar>
+{% endif %}
+            <setvar action="Set" varname="SCORE">100</setvar>
+          </respcondition>
+{% endfor %}
+        </resprocessing>
+{% if item.explanation %}
+        <itemfeedback ident="general_fb"><flow_mat><material><mattext texttype="text/plain">{{ item.explanation }}</mattext></material></flow_mat></itemfeedback>
+{% endif %}
+      </item>
+{% endfor %}
+{% endfor %}
+    </section>
+  </assessment>
+</questestinterop>
+"""
 
-    return filtered_data
+# Moodle question type and Canvas question type for each of our question types
+_EXPORT_TYPES = {
+    "multiple_choice": ("multichoice", "multiple_choice_question"),
+    "true_false": ("truefalse", "true_false_question"),
+    "fill_in_blank": ("shortanswer", "short_answer_question"),
+    "short_answer": ("shortanswer", "short_answer_question")
+}
+
+# Compiled once; autoescaping makes question text safe inside XML
+_TEMPLATES = {}
+if jinja2 is not None:
+    _template_env = jinja2.Environment(trim_blocks=True, lstrip_blocks=True, autoescape=True, cache_size=-1)
+    _TEMPLATES = {
+        "moodle": _template_env.from_string(MOODLE_XML_TEMPLATE),
+        "canvas": _template_env.from_string(CANVAS_QTI_TEMPLATE)
+    }
+
+
+def _export_item(std_data: Dict, q: Dict, number: int, position: str) -> Dict:
+    """
+    Flatten one question into the fields the export templates use
+
+    position ("d<document>_s<standard>") keeps idents unique, since standard
+    IDs repeat across documents.
+    """
+    moodle_type, canvas_type = _EXPORT_TYPES.get(q.get('question_type'), _EXPORT_TYPES['short_answer'])
+    correct_answer = str(q.get('correct_answer', ''))
+
+    if moodle_type == "multichoice":
+        choices = [str(option) for option in q.get('options') or []]
+    elif moodle_type == "truefalse":
+        # Moodle matches true/false answers by these exact lowercase words
+        choices = ["true", "false"]
+        correct_answer = "true" if correct_answer.strip().lower() in ("true", "t", "yes") else "false"
+    else:
+        choices = [correct_answer]
+
+    std_id = std_data.get('standard_id', 'unknown')
+    return {
+        "ident": f"{position}_{std_id}_q{number}".replace('.', '_'),
+        "name": f"{std_id} Q{number}",
+        "text": q.get('question_text', ''),
+        "explanation": q.get('explanation') or '',
+        "moodle_type": moodle_type,
+        "canvas_type": canvas_type,
+        "answers": [
+            {"index": i, "text": choice, "correct": choice == correct_answer}
+            for i, choice in enumerate(choices, 1)
+        ]
+    }
+
+
+def _export_documents(questions_data: Dict) -> List[Tuple[str, List[Dict]]]:
+    """Per-document lists of flattened questions, so templates need no nested traversal"""
+    documents = []
+    for doc_number, (doc_key, doc_data) in enumerate(questions_data.items(), 1):
+        items = [
+            _export_item(std_data, q, number, f"d{doc_number}_s{std_number}")
+            for std_number, std_data in enumerate(standards_of(doc_data), 1)
+            for number, q in enumerate(std_data.get('questions', []), 1)
+        ]
+        documents.append((doc_key, items))
+    return documents
 
 
 def export_to_quiz_format(questions_data: Dict, format_type: str = "generic") -> str:
@@ -172,44 +639,73 @@ def export_to_quiz_format(questions_data: Dict, format_type: str = "generic") ->
 
     Args:
         questions_data: Questions data to export
-        format_type: Format type (generic, moodle, canvas, etc.)
+        format_type: Format type: generic (JSON), moodle (Moodle XML) or
+            canvas (QTI 1.2 XML for Canvas); unknown types export JSON
 
     Returns:
         Formatted string
     """
+    if format_type in ("moodle", "canvas"):
+        if jinja2 is None:
+            raise ImportError(f"jinja2 is required for the {format_type} export: pip install jinja2")
+        # Rendered piece by piece from the compiled template
+        return ''.join(_TEMPLATES[format_type].generate(documents=_export_documents(questions_data)))
+
     if format_type == "generic":
-        return json.dumps(questions_data, indent=2)
+        return json_utils.dumps(questions_data).decode('utf-8')
 
     # Add more formats as needed
-    return json.dumps(questions_data, indent=2)
+    return json_utils.dumps(questions_data).decode('utf-8')
 
 
-def merge_question_data(data1: Dict, data2: Dict) -> Dict:
+def merge_question_data(
+    data1: Dict,
+    data2: Dict,
+    index_cache: Optional[Dict[str, Tuple[List[Dict], Dict[str, Dict]]]] = None
+) -> Dict:
     """
     Merge two question data dictionaries
 
     Args:
         data1: First questions data
         data2: Second questions data
+        index_cache: Optional dict, filled in as doc_key -> (standards list,
+            {standard_id: standard}), to pass back on the next call when merging
+            chunks into the same data; entries for other lists are rebuilt
 
     Returns:
         Merged questions data
     """
     merged = data1.copy()
+    if index_cache is None:
+        index_cache = {}
 
     for doc_key, doc_data in data2.items():
         if doc_key in merged:
-            # Merge standards
-            existing_standards = {s['standard_id']: s for s in merged[doc_key]['standards']}
+            # Merge standards; indexed documents (see index_standards) need no lookup table
+            standards = merged[doc_key]['standards']
+            if isinstance(standards, dict):
+                existing_standards = standards
+            else:
+                cached = index_cache.get(doc_key)
+                if cached is not None and cached[0] is standards and len(cached[1]) == len(standards):
+                    existing_standards = cached[1]
+                else:
+                    # Not cached yet, cached for other data, or changed outside this function
+                    existing_standards = {s['standard_id']: s for s in standards}
+                    index_cache[doc_key] = (standards, existing_standards)
 
-            for std_data in doc_data['standards']:
+            for std_data in standards_of(doc_data):
                 std_id = std_data['standard_id']
                 if std_id in existing_standards:
                     # Append questions to existing standard
                     existing_standards[std_id]['questions'].extend(std_data['questions'])
-                else:
+                elif isinstance(standards, dict):
                     # Add new standard
-                    merged[doc_key]['standards'].append(std_data)
+                    standards[std_id] = std_data
+                else:
+                    standards.append(std_data)
+                    existing_standards[std_id] = std_data
         else:
             # Add new document
             merged[doc_key] = doc_data
@@ -217,19 +713,32 @@ def merge_question_data(data1: Dict, data2: Dict) -> Dict:
     return merged
 
 
-def generate_report(questions_data: Dict) -> str:
+def _report_lines(counts: Dict[str, int], total: int, label: Callable[[str], str]) -> List[str]:
+    """Format 'Label: count (pct%)' report lines, with the percentages computed in one array operation"""
+    names = list(counts)
+    values = np.fromiter(counts.values(), dtype=np.int64, count=len(names))
+    percentages = values / total * 100 if total > 0 else np.zeros(len(names))
+    return [
+        f"{label(name)}: {count} ({percentage:.1f}%)\n"
+        for name, count, percentage in zip(names, values.tolist(), percentages.tolist())
+    ]
+
+
+def generate_report(questions_data: Dict, stats: Optional[Dict] = None) -> str:
     """
     Generate a text report of the questions data
 
     Args:
         questions_data: Questions data to report on
+        stats: Precomputed calculate_statistics(questions_data), to avoid walking the data again
 
     Returns:
         Formatted report string
     """
-    stats = calculate_statistics(questions_data)
+    if stats is None:
+        stats = calculate_statistics(questions_data)
 
-    report = f"""
+    parts = [f"""
 SOL QUIZ GENERATOR REPORT
 Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 
@@ -242,83 +751,281 @@ Avg Questions per Standard: {stats['avg_questions_per_standard']:.2f}
 
 QUESTIONS BY TYPE
 -----------------
-"""
+"""]
 
-    for q_type, count in stats['by_type'].items():
-        percentage = (count / stats['total_questions'] * 100) if stats['total_questions'] > 0 else 0
-        report += f"{q_type.replace('_', ' ').title()}: {count} ({percentage:.1f}%)\n"
+    parts.extend(_report_lines(stats['by_type'], stats['total_questions'], lambda q_type: q_type.replace('_', ' ').title()))
 
-    report += """
+    parts.append("""
 QUESTIONS BY DIFFICULTY
 -----------------------
-"""
+""")
 
-    for difficulty, count in stats['by_difficulty'].items():
-        percentage = (count / stats['total_questions'] * 100) if stats['total_questions'] > 0 else 0
-        report += f"{difficulty.title()}: {count} ({percentage:.1f}%)\n"
+    parts.extend(_report_lines(stats['by_difficulty'], stats['total_questions'], str.title))
 
-    report += """
+    parts.append("""
 STANDARDS BY FEASIBILITY
 ------------------------
-"""
+""")
 
-    for feasibility, count in stats['by_feasibility'].items():
-        percentage = (count / stats['total_standards'] * 100) if stats['total_standards'] > 0 else 0
-        report += f"{feasibility.replace('_', ' ').title()}: {count} ({percentage:.1f}%)\n"
+    parts.extend(_report_lines(stats['by_feasibility'], stats['total_standards'], lambda feasibility: feasibility.replace('_', ' ').title()))
 
-    return report
+    return ''.join(parts)
 
 
 def get_question_type_icon(question_type: str) -> str:
     """Get icon for question type"""
-    icons = {
-        "multiple_choice": "🔘",
-        "fill_in_blank": "📝",
-        "true_false": "✓✗",
-        "short_answer": "💭"
-    }
-    return icons.get(question_type, "❓")
+    return _QUESTION_TYPE_ICONS[_QUESTION_TYPE_INDEX.get(question_type, 4)]
 
 
-def search_questions(questions_data: Dict, search_term: str) -> Dict:
+def _term_matcher(terms: List[str], match_all: bool) -> Callable[[str], bool]:
+    """
+    Compile lowercase search terms once into a predicate over search text
+
+    Args:
+        terms: Lowercase terms to look for
+        match_all: Require every term (AND) rather than any term (OR)
+
+    Returns:
+        Function taking search text and returning whether it matches
+    """
+    if hyperscan is not None:
+        db = hyperscan.Database()
+        db.compile(
+            expressions=[re.escape(term).encode('utf-8') for term in terms],
+            ids=list(range(len(terms))),
+            elements=len(terms),
+            flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * len(terms)
+        )
+
+        def scan(blob: str) -> bool:
+            found = set()
+
+            def on_match(term_id, start, end, flags, context):
+                found.add(term_id)
+                # Returning True stops the scan
+                return not match_all or len(found) == len(terms)
+
+            try:
+                db.scan(blob.encode('utf-8'), match_event_handler=on_match)
+            except hyperscan.ScanTerminated:
+                pass  # Stopped early by on_match
+            return len(found) == len(terms) if match_all else bool(found)
+
+        return scan
+
+    if match_all:
+        return lambda blob: all(term in blob for term in terms)
+
+    pattern = re.compile('|'.join(map(re.escape, terms)))
+    return lambda blob: pattern.search(blob) is not None
+
+
+_TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def build_search_index(questions_data: Dict) -> Dict:
+    """
+    Inverted index of the words in every question and standard ID, for search_questions
+
+    Rebuild it after questions data changes.
+
+    Returns:
+        {'entries': [(doc_key, std_data, question or None for the standard ID)],
+        'postings': {word: set of entry positions}}
+    """
+    entries = []
+    postings = defaultdict(set)
+
+    for doc_key, std_data in iter_standards(questions_data):
+        for q in [None] + list(std_data.get('questions', [])):
+            blob = _standard_search_text(std_data) if q is None else _question_search_text(q)
+            for token in set(_TOKEN_PATTERN.findall(blob)):
+                postings[token].add(len(entries))
+            entries.append((doc_key, std_data, q))
+
+    return {'entries': entries, 'postings': dict(postings)}
+
+
+def _index_candidates(index: Dict, terms: List[str], match_all: bool) -> Optional[set]:
+    """
+    Entry positions that can contain the terms, or None when the index cannot narrow them
+
+    Any text containing a term contains each word of that term inside one of
+    its own words, so a term's candidates are the intersection, over its
+    words, of the postings of every indexed word containing that word.
+    """
+    postings = index['postings']
+    combined = None
+
+    for term in terms:
+        candidates = None
+        for word in set(_TOKEN_PATTERN.findall(term)):
+            with_word = set().union(*(ids for token, ids in postings.items() if word in token))
+            candidates = with_word if candidates is None else candidates & with_word
+        if candidates is None:
+            # No words to look up (e.g. punctuation only); every entry is a candidate
+            if not match_all:
+                return None
+            continue
+        if combined is None:
+            combined = candidates
+        else:
+            combined = combined & candidates if match_all else combined | candidates
+
+    return combined
+
+
+def search_questions(
+    questions_data: Dict,
+    search_term: str,
+    mode: str = "phrase",
+    index: Optional[Dict] = None
+) -> Dict:
     """
     Search questions by text
 
+    Lowercased question text is cached by content (see SEARCH_TEXT_CACHE_SIZE),
+    so the data itself is never modified.
+
     Args:
         questions_data: Questions data to search
         search_term: Text to search for
+        mode: "phrase" matches the whole search term; "all" or "any" split it
+            on whitespace and require every term or at least one
+        index: build_search_index(questions_data), to check only candidate
+            questions instead of scanning everything
 
     Returns:
         Filtered questions data containing search term
     """
+    if mode not in ("phrase", "all", "any"):
+        raise ValueError(f"Unknown search mode: {mode}")
+
     search_term = search_term.lower()
-    filtered_data = {}
+    terms = search_term.split()
+    if mode == "phrase" or len(terms) < 2:
+        # A single substring test needs no compiled matcher
+        term = search_term if mode == "phrase" else ''.join(terms)
+        terms = [term]
+        matches = lambda blob: term in blob
+    else:
+        matches = _term_matcher(terms, match_all=(mode == "all"))
+
+    selected = defaultdict(dict)
+
+    candidates = _index_candidates(index, terms, mode != "any") if index is not None else None
+    if candidates is not None:
+        # Entries are in document order with each standard ID before its questions
+        for position in sorted(candidates):
+            doc_key, std_data, q = index['entries'][position]
+            kept = selected.get(doc_key, {}).get(id(std_data), [])
+            if kept is None:
+                continue  # Whole standard already kept
+            if q is None:
+                if matches(_standard_search_text(std_data)):
+                    selected[doc_key][id(std_data)] = None
+            elif matches(_question_search_text(q)):
+                selected[doc_key][id(std_data)] = kept + [q] if kept else [q]
+        return _rebuild(questions_data, selected)
+
+    for doc_key, std_data in iter_standards(questions_data):
+        # A matching standard ID keeps the whole standard
+        if matches(_standard_search_text(std_data)):
+            selected[doc_key][id(std_data)] = None
+            continue
+
+        # Search in questions (text, answer and options)
+        filtered_questions = [
+            q for q in std_data.get('questions', [])
+            if matches(_question_search_text(q))
+        ]
+        if filtered_questions:
+            selected[doc_key][id(std_data)] = filtered_questions
+
+    return _rebuild(questions_data, selected)
+
+
+FRAME_COLUMNS = [
+    'doc_key', 'std_index', 'q_index', 'standard_id',
+    'question_type', 'difficulty_level', 'feasibility', 'search_text'
+]
+
+
+def questions_frame(questions_data: Dict) -> pd.DataFrame:
+    """
+    Flat table of questions (one row each) for filtering and searching with pandas
 
-    for doc_key, doc_data in questions_data.items():
-        filtered_standards = []
+    Build it once after loading; std_index and q_index locate each row's
+    question in questions_data for questions_from_frame.
 
-        for std_data in doc_data.get('standards', []):
-            # Check if standard ID or statement matches
-            if search_term in std_data.get('standard_id', '').lower():
-                filtered_standards.append(std_data)
-                continue
+    Returns:
+        DataFrame with FRAME_COLUMNS
+    """
+    rows = [
+        (
+            doc_key, std_index, q_index, std_data.get('standard_id', ''),
+            q.get('question_type', 'unknown'), q.get('difficulty_level', 'unknown'),
+            std_data.get('assessment', {}).get('feasibility', 'unknown'),
+            _question_search_text(q)
+        )
+        for doc_key, doc_data in questions_data.items()
+        for std_index, std_data in enumerate(standards_of(doc_data))
+        for q_index, q in enumerate(std_data.get('questions', []))
+    ]
+    frame = pd.DataFrame(rows, columns=FRAME_COLUMNS)
+    for column in ('question_type', 'difficulty_level', 'feasibility'):
+        frame[column] = frame[column].astype('category')
+    return frame
+
+
+def filter_frame(
+    frame: pd.DataFrame,
+    question_types: Optional[List[str]] = None,
+    difficulty_levels: Optional[List[str]] = None,
+    feasibility: Optional[List[str]] = None,
+    search_term: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Rows of a questions_frame matching the filter_questions and search_questions criteria
+
+    A search term matches a question's text, answer or options, or its
+    standard ID (which keeps every question of that standard).
+    """
+    question_types = _filter_set(question_types)
+    difficulty_levels = _filter_set(difficulty_levels)
+    feasibility = _filter_set(feasibility)
+
+    mask = np.ones(len(frame), dtype=bool)
+    if question_types is not None:
+        mask &= frame['question_type'].str.lower().isin(question_types).to_numpy()
+    if difficulty_levels is not None:
+        mask &= frame['difficulty_level'].str.lower().isin(difficulty_levels).to_numpy()
+    if feasibility is not None:
+        mask &= frame['feasibility'].str.lower().isin(feasibility).to_numpy()
+    if search_term:
+        term = search_term.lower()
+        mask &= (
+            frame['search_text'].str.contains(term, regex=False) |
+            frame['standard_id'].str.lower().str.contains(term, regex=False)
+        ).to_numpy()
+    return frame[mask]
+
+
+def questions_from_frame(questions_data: Dict, rows: pd.DataFrame) -> Dict:
+    """
+    Nested questions data for the given questions_frame rows only
 
-            # Search in questions
-            filtered_questions = []
-            for q in std_data.get('questions', []):
-                if (search_term in q.get('question_text', '').lower() or
-                    search_term in q.get('correct_answer', '').lower() or
-                    any(search_term in opt.lower() for opt in q.get('options', []))):
-                    filtered_questions.append(q)
+    Pass a slice (e.g. the page being rendered) to avoid rebuilding
+    everything that matched.
+    """
+    selected = defaultdict(dict)
+    standards_by_doc = {}
 
-            if filtered_questions:
-                filtered_std = std_data.copy()
-                filtered_std['questions'] = filtered_questions
-                filtered_standards.append(filtered_std)
+    for doc_key, std_index, q_index in zip(rows['doc_key'], rows['std_index'], rows['q_index']):
+        if doc_key not in standards_by_doc:
+            standards_by_doc[doc_key] = list(standards_of(questions_data[doc_key]))
+        std_data = standards_by_doc[doc_key][std_index]
+        selected[doc_key].setdefault(id(std_data), []).append(std_data['questions'][q_index])
 
-        if filtered_standards:
-            filtered_doc = doc_data.copy()
-            filtered_doc['standards'] = filtered_standards
-            filtered_data[doc_key] = filtered_doc
+    return _rebuild(questions_data, selected)
 
-    return filtered_data